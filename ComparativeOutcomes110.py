@@ -2,9 +2,12 @@ import ParameterClasses as P
 import MarkovModel as MarkovCls
 import SupportMarkovModel110 as SupportMarkov
 
+# both cohorts use the same id so that patient i in each arm uses the same random numbers
+# (common random numbers), which allows a paired comparison
+
 # Dab 110
 # create a cohort
-cohort_dabigitran110 = MarkovCls.Cohort(id=3, therapy=P.Therapies.DABIGITRAN110)
+cohort_dabigitran110 = MarkovCls.Cohort(id=1, therapy=P.Therapies.DABIGITRAN110)
 simOutputs_dabigitran110 = cohort_dabigitran110.simulate()
 
 # Warfarin
@@ -20,8 +23,8 @@ SupportMarkov.print_outcomes(simOutputs_warfarin, "Warfarin therapy")
 SupportMarkov.print_outcomes(simOutputs_dabigitran110, "Dabigitran110 therapy")
 
 # print comparative outcomes
-SupportMarkov.print_comparative_outcomes(simOutputs_warfarin,simOutputs_dabigitran110,)
+SupportMarkov.print_comparative_outcomes(simOutputs_warfarin,simOutputs_dabigitran110, if_paired=True)
 
 # report the CEA results
-SupportMarkov.report_CEA_CBA(simOutputs_warfarin, simOutputs_dabigitran110)
+SupportMarkov.report_CEA_CBA(simOutputs_warfarin, simOutputs_dabigitran110, if_paired=True)
 
@@ -1,27 +1,26 @@
-import ParameterClassesSens2Cost as P
-import MarkovModelSens2Cost as MarkovCls
-import SupportMarkovModel110Sens2 as SupportMarkov
+import ParameterClasses as P
+import Scenarios
+import SupportMarkovModel110 as SupportMarkov
+#NEW OUTCOMES WHEN THE COST OF DABIGATRAN IS DECREASED
+# both cohorts use the same id so that patient i in each arm uses the same random numbers
+# (common random numbers), which allows a paired comparison
+runner = Scenarios.ScenarioRunner()
 
-# Dab 110
-# create a cohort
-cohort_dabigitran110 = MarkovCls.Cohort(id=3, therapy=P.Therapies.DABIGITRAN110)
-simOutputs_dabigitran110 = cohort_dabigitran110.simulate()
-
-# Warfarin
-# create a cohort
-cohort_warfarin= MarkovCls.Cohort(id=1, therapy=P.Therapies.WARFARIN)
-simOutputs_warfarin = cohort_warfarin.simulate()
+# Dab 110 and Warfarin
+simOutputs_dabigitran110, simOutputs_warfarin = runner.simulate_comparison(
+    scenario=Scenarios.DABIGATRAN_COST_1800,
+    therapies=[P.Therapies.DABIGITRAN110, P.Therapies.WARFARIN],
+    cohort_id=1)
 
 # draw survival curves and histograms
-SupportMarkov.draw_survival_curves_and_histograms(simOutputs_warfarin,simOutputs_dabigitran110)
+SupportMarkov.draw_survival_curves_and_histograms(simOutputs_warfarin, simOutputs_dabigitran110)
 
 # print the estimates
-SupportMarkov.print_outcomes(simOutputs_warfarin, "Warfarin therapy")
 SupportMarkov.print_outcomes(simOutputs_dabigitran110, "Dabigitran110 therapy")
+SupportMarkov.print_outcomes(simOutputs_warfarin, "Warfarin therapy")
 
 # print comparative outcomes
-SupportMarkov.print_comparative_outcomes(simOutputs_warfarin, simOutputs_dabigitran110)
+SupportMarkov.print_comparative_outcomes(simOutputs_warfarin, simOutputs_dabigitran110, if_paired=True)
 
 # report the CEA results
-SupportMarkov.report_CEA_CBA(simOutputs_warfarin,simOutputs_dabigitran110)
-
+SupportMarkov.report_CEA_CBA(simOutputs_warfarin, simOutputs_dabigitran110, if_paired=True)
@@ -2,9 +2,12 @@ import ParameterClasses as P
 import MarkovModel as MarkovCls
 import SupportMarkovModel150 as SupportMarkov
 
+# both cohorts use the same id so that patient i in each arm uses the same random numbers
+# (common random numbers), which allows a paired comparison
+
 # Dab 150
 # create a cohort
-cohort_dabigitran150 = MarkovCls.Cohort(id=4, therapy=P.Therapies.DABIGITRAN150)
+cohort_dabigitran150 = MarkovCls.Cohort(id=1, therapy=P.Therapies.DABIGITRAN150)
 simOutputs_dabigitran150 = cohort_dabigitran150.simulate()
 
 # Warfarin
@@ -20,8 +23,8 @@ SupportMarkov.print_outcomes(simOutputs_dabigitran150, "Dabigitran150 therapy")
 SupportMarkov.print_outcomes(simOutputs_warfarin, "Warfarin theraoy")
 
 # print comparative outcomes
-SupportMarkov.print_comparative_outcomes(simOutputs_warfarin,simOutputs_dabigitran150)
+SupportMarkov.print_comparative_outcomes(simOutputs_warfarin,simOutputs_dabigitran150, if_paired=True)
 
 # report the CEA results
-SupportMarkov.report_CEA_CBA(simOutputs_warfarin,simOutputs_dabigitran150)
+SupportMarkov.report_CEA_CBA(simOutputs_warfarin,simOutputs_dabigitran150, if_paired=True)
 
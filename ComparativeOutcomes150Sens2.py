@@ -1,16 +1,16 @@
-import ParameterClassesSens2Cost as P
-import MarkovModelSens2Cost as MarkovCls
-import SupportMarkovModel150Sens2 as SupportMarkov
-#NEW OUTCOMES WHEN THE BASELINE STROKE RATE IS INCREASED
-# Dab 150
-# create a cohort
-cohort_dabigitran150 = MarkovCls.Cohort(id=4, therapy=P.Therapies.DABIGITRAN150)
-simOutputs_dabigitran150 = cohort_dabigitran150.simulate()
+import ParameterClasses as P
+import Scenarios
+import SupportMarkovModel150 as SupportMarkov
+#NEW OUTCOMES WHEN THE COST OF DABIGATRAN IS DECREASED
+# both cohorts use the same id so that patient i in each arm uses the same random numbers
+# (common random numbers), which allows a paired comparison
+runner = Scenarios.ScenarioRunner()
 
-# Warfarin
-# create a cohort
-cohort_warfarin= MarkovCls.Cohort(id=1, therapy=P.Therapies.WARFARIN)
-simOutputs_warfarin = cohort_warfarin.simulate()
+# Dab 150 and Warfarin
+simOutputs_dabigitran150, simOutputs_warfarin = runner.simulate_comparison(
+    scenario=Scenarios.DABIGATRAN_COST_1800,
+    therapies=[P.Therapies.DABIGITRAN150, P.Therapies.WARFARIN],
+    cohort_id=1)
 
 # draw survival curves and histograms
 SupportMarkov.draw_survival_curves_and_histograms(simOutputs_warfarin, simOutputs_dabigitran150)
@@ -20,8 +20,7 @@ SupportMarkov.print_outcomes(simOutputs_dabigitran150, "Dabigitran150 therapy")
 SupportMarkov.print_outcomes(simOutputs_warfarin, "Warfarin therapy")
 
 # print comparative outcomes
-SupportMarkov.print_comparative_outcomes(simOutputs_warfarin,simOutputs_dabigitran150)
+SupportMarkov.print_comparative_outcomes(simOutputs_warfarin, simOutputs_dabigitran150, if_paired=True)
 
 # report the CEA results
-SupportMarkov.report_CEA_CBA(simOutputs_warfarin,simOutputs_dabigitran150)
-
+SupportMarkov.report_CEA_CBA(simOutputs_warfarin, simOutputs_dabigitran150, if_paired=True)
@@ -0,0 +1,22 @@
+import ParameterClasses as P
+import Scenarios
+import SupportMarkovModel110
+import SupportMarkovModel150
+
+# compare both doses of dabigatran with warfarin under every scenario in one process
+# (a cohort is simulated once for all scenarios that do not change the inputs of its therapy)
+runner = Scenarios.ScenarioRunner()
+
+for scenario in Scenarios.SCENARIOS:
+    print('\n' + scenario.get_name())
+
+    for therapy, SupportMarkov in [(P.Therapies.DABIGITRAN110, SupportMarkovModel110),
+                                   (P.Therapies.DABIGITRAN150, SupportMarkovModel150)]:
+        simOutputs_dabigitran, simOutputs_warfarin = runner.simulate_comparison(
+            scenario=scenario, therapies=[therapy, P.Therapies.WARFARIN], cohort_id=1)
+
+        # print comparative outcomes and report the CEA results
+        SupportMarkov.print_comparative_outcomes(simOutputs_warfarin, simOutputs_dabigitran, if_paired=True)
+        SupportMarkov.report_CEA_CBA(simOutputs_warfarin, simOutputs_dabigitran, if_paired=True)
+
+print('\nNumber of cohorts simulated:', runner.get_n_simulated_cohorts())
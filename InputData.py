@@ -1,3 +1,5 @@
+import os
+import sys
 import numpy as np
 
 # Updated the simulation length to be 20 years based on the study and Delta T to be monthly (1/52) from Methods- Decision Model
@@ -62,64 +64,79 @@ q = 1/(1/52)
 # Part 6: Transition rate matrices on base case and 4 therapies
 
 
-# transition rate matrix (aspirin)
-TRANS_MATRIX_ASPIRIN = [
-    [None,  d*h,  d*i, d*p, d*j, 0.0, a],  # Well
-    [0.0,   None, 0.0, 0.0, 0.0, q, 0.0],  # Minor Stroke
-    [0.0, 0.0, None, 0.0, 0.0, q, 0.0],    # Major Stroke
-    [0.0, 0.0, 0.0, None, 0.0, q, 0.0],    # TIA
-    [0.0, 0.0, 0.0, 0.0, None, 0.0, 0.0],  # Stroke-Death
-    [0.0, d*h*recur_stroke_rate, d*i*recur_stroke_rate, d*p*recur_stroke_rate, d*j,   None,  a],   # Post-Stroke
-    [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, None],  # Death
-    ]
-
-# transition rate matrix (aspirin/clopidogrel)
-TRANS_MATRIX_DUAL = [
-    [None,  e*h,  e*i, e*p, e*j, 0.0, a],  # Well
-    [0.0,   None, 0.0, 0.0, 0.0, q, 0.0],  # Minor Stroke
-    [0.0, 0.0, None, 0.0, 0.0, q, 0.0],    # Major Stroke
-    [0.0, 0.0, 0.0, None, 0.0, q, 0.0],    # TIA
-    [0.0, 0.0, 0.0, 0.0, None, 0.0, 0.0],  # Stroke-Death
-    [0.0, e*h*recur_stroke_rate, e*i*recur_stroke_rate, e*p*recur_stroke_rate, e*j,   None,  a],   # Post-Stroke
-    [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, None],  # Death
-    ]
-
-# transition rate matrix (Warfarin)
-TRANS_MATRIX_WARFARIN = [
-    [None,  s*l,  s*m, s*p, s*j, 0.0, b],  # Well
-    [0.0,   None, 0.0, 0.0, 0.0, q, 0.0],  # Minor Stroke
-    [0.0, 0.0, None, 0.0, 0.0, q, 0.0],    # Major Stroke
-    [0.0, 0.0, 0.0, None, 0.0, q, 0.0],    # TIA
-    [0.0, 0.0, 0.0, 0.0, None, 0.0, 0.0],  # Stroke-Death
-    [0.0, s*h*recur_stroke_rate, s*i*recur_stroke_rate, s*p*recur_stroke_rate, s*j,   None,  b],   # Post-Stroke
-    [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, None],  # Death
-    ]
-
-
-# transition rate matrix (Dabigatran 110)
-TRANS_MATRIX_DABIGATRAN110= [
-    [None,  f*h,  f*i, f*p, f*j, 0.0, c],  # Well
-    [0.0,   None, 0.0, 0.0, 0.0, q, 0.0],  # Minor Stroke
-    [0.0, 0.0, None, 0.0, 0.0, q, 0.0],    # Major Stroke
-    [0.0, 0.0, 0.0, None, 0.0, q, 0.0],    # TIA
-    [0.0, 0.0, 0.0, 0.0, None, 0.0, 0.0],  # Stroke-Death
-    [0.0, f*h*recur_stroke_rate, f*i*recur_stroke_rate, f*p*recur_stroke_rate, f*j,   None,  c],   # Post-Stroke
-    [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, None],  # Death
-    ]
-
-
-# transition rate matrix (Dabigatran 150)
-TRANS_MATRIX_DABIGATRAN150= [
-    [None,  g*h,  g*i, g*p, g*j, 0.0, c],  # Well
-    [0.0,   None, 0.0, 0.0, 0.0, q, 0.0],  # Minor Stroke
-    [0.0, 0.0, None, 0.0, 0.0, q, 0.0],    # Major Stroke
-    [0.0, 0.0, 0.0, None, 0.0, q, 0.0],    # TIA
-    [0.0, 0.0, 0.0, 0.0, None, 0.0, 0.0],  # Stroke-Death
-    [0.0, g*h*recur_stroke_rate, g*i*recur_stroke_rate, g*p*recur_stroke_rate, g*j,   None,  c],   # Post-Stroke
-    [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, None],  # Death
-    ]
-
-
+def get_trans_rate_matrices(inputs):
+    """ :returns the transition rate matrices of (aspirin, aspirin/clopidogrel, warfarin, dabigatran 110,
+    dabigatran 150) calculated from the rates and probabilities above
+    :param inputs: this module, or an object with the same rates and probabilities
+    """
+    a, b, c = inputs.a, inputs.b, inputs.c
+    d, e, s, f, g = inputs.d, inputs.e, inputs.s, inputs.f, inputs.g
+    p, h, i, j, l, m = inputs.p, inputs.h, inputs.i, inputs.j, inputs.l, inputs.m
+    recur_stroke_rate, q = inputs.recur_stroke_rate, inputs.q
+
+    # transition rate matrix (aspirin)
+    TRANS_MATRIX_ASPIRIN = [
+        [None,  d*h,  d*i, d*p, d*j, 0.0, a],  # Well
+        [0.0,   None, 0.0, 0.0, 0.0, q, 0.0],  # Minor Stroke
+        [0.0, 0.0, None, 0.0, 0.0, q, 0.0],    # Major Stroke
+        [0.0, 0.0, 0.0, None, 0.0, q, 0.0],    # TIA
+        [0.0, 0.0, 0.0, 0.0, None, 0.0, 0.0],  # Stroke-Death
+        [0.0, d*h*recur_stroke_rate, d*i*recur_stroke_rate, d*p*recur_stroke_rate, d*j,   None,  a],   # Post-Stroke
+        [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, None],  # Death
+        ]
+
+    # transition rate matrix (aspirin/clopidogrel)
+    TRANS_MATRIX_DUAL = [
+        [None,  e*h,  e*i, e*p, e*j, 0.0, a],  # Well
+        [0.0,   None, 0.0, 0.0, 0.0, q, 0.0],  # Minor Stroke
+        [0.0, 0.0, None, 0.0, 0.0, q, 0.0],    # Major Stroke
+        [0.0, 0.0, 0.0, None, 0.0, q, 0.0],    # TIA
+        [0.0, 0.0, 0.0, 0.0, None, 0.0, 0.0],  # Stroke-Death
+        [0.0, e*h*recur_stroke_rate, e*i*recur_stroke_rate, e*p*recur_stroke_rate, e*j,   None,  a],   # Post-Stroke
+        [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, None],  # Death
+        ]
+
+    # transition rate matrix (Warfarin)
+    TRANS_MATRIX_WARFARIN = [
+        [None,  s*l,  s*m, s*p, s*j, 0.0, b],  # Well
+        [0.0,   None, 0.0, 0.0, 0.0, q, 0.0],  # Minor Stroke
+        [0.0, 0.0, None, 0.0, 0.0, q, 0.0],    # Major Stroke
+        [0.0, 0.0, 0.0, None, 0.0, q, 0.0],    # TIA
+        [0.0, 0.0, 0.0, 0.0, None, 0.0, 0.0],  # Stroke-Death
+        [0.0, s*h*recur_stroke_rate, s*i*recur_stroke_rate, s*p*recur_stroke_rate, s*j,   None,  b],   # Post-Stroke
+        [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, None],  # Death
+        ]
+
+
+    # transition rate matrix (Dabigatran 110)
+    TRANS_MATRIX_DABIGATRAN110= [
+        [None,  f*h,  f*i, f*p, f*j, 0.0, c],  # Well
+        [0.0,   None, 0.0, 0.0, 0.0, q, 0.0],  # Minor Stroke
+        [0.0, 0.0, None, 0.0, 0.0, q, 0.0],    # Major Stroke
+        [0.0, 0.0, 0.0, None, 0.0, q, 0.0],    # TIA
+        [0.0, 0.0, 0.0, 0.0, None, 0.0, 0.0],  # Stroke-Death
+        [0.0, f*h*recur_stroke_rate, f*i*recur_stroke_rate, f*p*recur_stroke_rate, f*j,   None,  c],   # Post-Stroke
+        [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, None],  # Death
+        ]
+
+
+    # transition rate matrix (Dabigatran 150)
+    TRANS_MATRIX_DABIGATRAN150= [
+        [None,  g*h,  g*i, g*p, g*j, 0.0, c],  # Well
+        [0.0,   None, 0.0, 0.0, 0.0, q, 0.0],  # Minor Stroke
+        [0.0, 0.0, None, 0.0, 0.0, q, 0.0],    # Major Stroke
+        [0.0, 0.0, 0.0, None, 0.0, q, 0.0],    # TIA
+        [0.0, 0.0, 0.0, 0.0, None, 0.0, 0.0],  # Stroke-Death
+        [0.0, g*h*recur_stroke_rate, g*i*recur_stroke_rate, g*p*recur_stroke_rate, g*j,   None,  c],   # Post-Stroke
+        [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, None],  # Death
+        ]
+
+    return TRANS_MATRIX_ASPIRIN, TRANS_MATRIX_DUAL, TRANS_MATRIX_WARFARIN, \
+        TRANS_MATRIX_DABIGATRAN110, TRANS_MATRIX_DABIGATRAN150
+
+
+TRANS_MATRIX_ASPIRIN, TRANS_MATRIX_DUAL, TRANS_MATRIX_WARFARIN, TRANS_MATRIX_DABIGATRAN110, TRANS_MATRIX_DABIGATRAN150 = \
+    get_trans_rate_matrices(sys.modules[__name__])
 
 
 #annual cost of each health state
@@ -133,6 +150,11 @@ ANNUAL_STATE_COST = [
 10000.0 #death
 ]
 
+# one-off cost of dying in years of the annual cost of the death state entered, charged at the time of death by
+# the continuous-time engine (the discrete-time engines charge half a time step of the annual cost of the death
+# state, 0.5 * DELTA_T years, which this equals at the monthly time step of the base case)
+DEATH_COST_YEARS = 1 / 24
+
 # annual health utility of each health state
 
 ANNUAL_STATE_UTILITY = [
@@ -150,3 +172,29 @@ ASPIRIN_COST = 10.0
 DUAL_COST= 1857.0
 WARFARIN_COST = 180
 DABIGATRAN_COST = 3240.0
+
+# Part 7: Distributions of inputs for probabilistic sensitivity analysis
+# annual rates (mortality, stroke and recurrent stroke) and state and drug costs are gamma distributed
+# with means equal to their values above and these coefficients of variation
+RATE_CV = 0.2
+COST_CV = 0.2
+# health utilities between 0 and 1 are beta distributed with means equal to their values above and this
+# standard deviation
+UTILITY_SD = 0.05
+# the probability of TIA (beta) and the stroke-severity splits (Dirichlet) are distributed as if they were
+# estimated from this number of strokes
+STROKE_SAMPLE_SIZE = 200
+
+# Part 8: One-way sensitivity analysis
+# inputs are varied between their values above times (1 - ONE_WAY_RANGE) and (1 + ONE_WAY_RANGE)
+# (probabilities and utilities are kept at most 1)
+ONE_WAY_RANGE = 0.25
+# willingness-to-pay for one additional QALY to calculate net monetary benefits
+WTP = 50000
+
+# Part 9: Directory of the on-disk cache of cohort outcomes (None to always simulate cohorts)
+# (next to this module, whatever directory scripts are started from; cached outcomes are found by a hash of the
+# inputs, cohort id, engine, code and library versions, so they never go stale, but entries are never evicted:
+# every scenario or one-way bound simulated adds one, so clear the cache with ResultCache.clear_cache() or by
+# deleting the directory)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cohort_cache')
@@ -0,0 +1,81 @@
+import numpy as np
+import scipy.stats as stat
+import scr.SamplePathClasses as PathCls
+
+
+class KaplanMeierCurve:
+    def __init__(self, name, survival_times, censoring_time=None):
+        """ Kaplan-Meier survival curve of a cohort, calculated from the array of survival times in one pass
+        (to graph the number of patients alive with scr.SamplePathClasses, see to_sample_path)
+        :param name: name of this curve
+        :param survival_times: patients' survival times (nan for patients who are still alive at the end of
+            the simulation, who are censored)
+        :param censoring_time: time at which patients still alive are censored, e.g. the simulation length
+            (None if they are censored after the last death)
+        """
+        self.name = name
+        survival_times = np.asarray(survival_times, dtype=float)
+        died = ~np.isnan(survival_times)
+        self._n = len(survival_times)
+        self._nCensored = self._n - int(np.count_nonzero(died))
+        self._censoringTime = censoring_time
+
+        # distinct times of death and the number of deaths at each
+        self._deathTimes, deaths = np.unique(survival_times[died], return_counts=True)
+
+        # number at risk just before each time of death (patients censored before it are no longer at risk)
+        deaths_before = np.cumsum(deaths) - deaths
+        self._atRisk = self._n - deaths_before
+        if censoring_time is not None:
+            self._atRisk -= np.where(self._deathTimes > censoring_time, self._nCensored, 0)
+        self._deaths = deaths
+
+        # product-limit estimate of survival and Greenwood's estimate of its variance
+        self._survival = np.cumprod(1 - deaths/self._atRisk)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            terms = deaths / (self._atRisk * (self._atRisk - deaths))
+            self._variance = np.where(self._survival > 0, self._survival**2 * np.cumsum(terms), 0)
+
+    def get_times(self):
+        """ :returns time 0 followed by the distinct times of death """
+        return np.concatenate(([0.0], self._deathTimes))
+
+    def get_values(self):
+        """ :returns the number of patients alive at time 0 and after each time of death """
+        return np.concatenate(([self._n], self._n - np.cumsum(self._deaths)))
+
+    def get_number_at_risk(self):
+        """ :returns the number of patients at risk just before each time of death """
+        return self._atRisk
+
+    def get_survival_probs(self):
+        """ :returns the estimated probability of surviving past time 0 and each time of death """
+        return np.concatenate(([1.0], self._survival))
+
+    def get_variances(self):
+        """ :returns Greenwood's estimate of the variance of each survival probability """
+        return np.concatenate(([0.0], self._variance))
+
+    def get_CI(self, alpha):
+        """ :returns the lower and upper bounds of the pointwise (1-alpha) confidence band of survival
+        probabilities (normal approximation with Greenwood's variance, within [0, 1]) """
+        half_width = stat.norm.ppf(1 - alpha/2) * np.sqrt(self.get_variances())
+        survival = self.get_survival_probs()
+        return np.clip(survival - half_width, 0, 1), np.clip(survival + half_width, 0, 1)
+
+    def get_n_censored(self):
+        """ :returns the number of patients who are still alive (censored) """
+        return self._nCensored
+
+    def get_censoring_time(self):
+        return self._censoringTime
+
+    def to_sample_path(self, itr=0):
+        """ :returns the number of patients alive over time as a sample path of the support library
+        (PathCls.SamplePathBatchUpdate, recorded once per time of death) for PathCls.graph_sample_path(s)
+        :param itr: iteration (replication) number of the sample path
+        """
+        sample_path = PathCls.SamplePathBatchUpdate(self.name, itr, self._n)
+        for time, deaths in zip(self._deathTimes.tolist(), self._deaths.tolist()):
+            sample_path.record(time, -deaths)
+        return sample_path
@@ -1,35 +1,51 @@
+from enum import Enum
+from concurrent.futures import ProcessPoolExecutor
+import math
+import os
+import shutil
+import tempfile
+import weakref
+import warnings
+import numpy as np
+from scipy.stats import qmc
 import scr.SamplePathClasses as PathCls
-import scr.StatisticalClasses as StatCls
 import scr.RandomVariantGenerators as rndClasses
-import scr.EconEvalClasses as EconCls
 import ParameterClasses as P
+import OnlineStats
+import OutcomeStore
+import KaplanMeier
+import ResultCache
+import Trajectories
 import InputData as Data
 
 
 class Patient:
-    def __init__(self, id, parameters):
+    def __init__(self, id, parameters, rng=None, record_path=False):
         """ initiates a patient
         :param id: ID of the patient
         :param parameters: parameter object
+        :param rng: random number generator (if None, rndClasses.RNG(id) is used)
+        :param record_path: set to True to record the health state at every time step
         """
 
         self._id = id
-        self._rng = None
+        self._rng = rng
         self._param = parameters
-        self._stateMonitor = PatientStateMonitor(parameters)
+        self._stateMonitor = PatientStateMonitor(parameters, record_path)
         self._delta_t = parameters.get_delta_t()
 
     def simulate(self, sim_length):
         """ simulate the patient over the specified simulation length """
         # random number generator for this patient
-        self._rng = rndClasses.RNG(self._id)  # from now on use random number generator from support library
+        if self._rng is None:
+            self._rng = rndClasses.RNG(self._id)  # from now on use random number generator from support library
 
         k = 0
 
         while self._stateMonitor.get_if_alive() and k*self._delta_t < sim_length:
-            trans_prob = self._param.get_transition_prob(self._stateMonitor.get_current_state())
-            empirical_dist = rndClasses.Empirical(trans_prob)
-            new_state_index = empirical_dist.sample(self._rng)
+            # sample the next state using the precompiled sampler of the current state
+            sampler = self._param.get_transition_sampler(self._stateMonitor.get_current_state())
+            new_state_index = sampler.sample(self._rng)
 
             self._stateMonitor.update(k, P.HealthStats(new_state_index))
             k += 1
@@ -46,15 +62,59 @@ class Patient:
     def get_total_discounted_utility(self):
         return self._stateMonitor.get_total_discounted_utility()
 
+    def get_path(self):
+        """ :returns the recorded health states (Trajectories.StateTrajectory), or None if not recorded """
+        return self._stateMonitor.get_path()
+
+
+class SkipAheadPatient(Patient):
+    def simulate(self, sim_length):
+        """ simulate the patient over the specified simulation length, jumping over the time steps
+        in which the patient stays in its current state (the number of such time steps is geometric) """
+        # random number generator for this patient
+        if self._rng is None:
+            self._rng = rndClasses.RNG(self._id)
+
+        # number of time steps to simulate (counted once with the parameters shared by the cohort)
+        if sim_length == self._param.get_sim_length():
+            n_steps = self._param.get_n_time_steps()
+        else:
+            n_steps = P.get_n_time_steps(sim_length, self._delta_t)
+
+        k = 0
+        while self._stateMonitor.get_if_alive() and k < n_steps:
+            state = self._stateMonitor.get_current_state()
+
+            # number of time steps before leaving the current state
+            self_loop_prob = self._param.get_self_loop_prob(state)
+            if self_loop_prob == 0:
+                n_stays = 0
+            elif self_loop_prob == 1:
+                n_stays = n_steps - k
+            else:
+                n_stays = int(math.log(1 - self._rng.random_sample()) / math.log(self_loop_prob))
+            n_stays = min(n_stays, n_steps - k)
+
+            self._stateMonitor.stay(k, n_stays)
+            k += n_stays
+            if k == n_steps:
+                break
+
+            # sample the next state given that the patient leaves its current state
+            new_state_index = self._param.get_leave_sampler(state).sample(self._rng)
+            self._stateMonitor.update(k, P.HealthStats(new_state_index))
+            k += 1
+
 
 class PatientStateMonitor:
-    def __init__(self, parameters):
+    def __init__(self, parameters, record_path=False):
         self._currentState = parameters.get_initial_health_state()
         self._delta_t = parameters.get_delta_t()
         self._survivalTime = 0
         self._ifDevelopedStroke = False
         self._strokeCount = 0
         self._costUtilityOutcomes = PatientCostUtilityMonitor(parameters)
+        self._path = Trajectories.StateTrajectory(self._currentState) if record_path else None
 
     def update(self, k, next_state):
         if not self.get_if_alive():
@@ -74,6 +134,21 @@ class PatientStateMonitor:
 
         # update current health state
         self._currentState = next_state
+        if self._path is not None:
+            self._path.extend(next_state)
+
+    def stay(self, k, n_steps):
+        """ updates the outcomes when the patient stays in its current state for time steps k, ..., k+n_steps-1 """
+        if n_steps == 0 or not self.get_if_alive():
+            return
+
+        if self._currentState in [P.HealthStats.MINOR_STROKE, P.HealthStats.MAJOR_STROKE, P.HealthStats.TIA]:
+            self._ifDevelopedStroke = True
+            self._strokeCount += n_steps
+
+        self._costUtilityOutcomes.stay(k, n_steps, self._currentState)
+        if self._path is not None:
+            self._path.extend(self._currentState, n_steps)
 
     def get_if_alive(self):
         result = True
@@ -103,6 +178,9 @@ class PatientStateMonitor:
         """:returns total discounted utility"""
         return self._costUtilityOutcomes.get_total_discounted_utility()
 
+    def get_path(self):
+        return self._path
+
 
 class PatientCostUtilityMonitor:
     def __init__(self, parameters):
@@ -110,6 +188,12 @@ class PatientCostUtilityMonitor:
         # model parameters for this patient
         self._param = parameters
 
+        # discount factor of each time step and cost and utility of each transition
+        self._discountFactors = parameters.get_discount_factors()
+        self._cumDiscountFactors = parameters.get_cumulative_discount_factors()
+        self._transitionCosts = parameters.get_transition_cost_matrix()
+        self._transitionUtilities = parameters.get_transition_utility_matrix()
+
         # total cost and utility
         self._totalDiscountedCost = 0
         self._totalDiscountedUtility = 0
@@ -121,26 +205,22 @@ class PatientCostUtilityMonitor:
         :param next_state: next health state
         """
 
-        # update cost
-        cost = 0.5*(self._param.get_annual_state_cost(current_state)+
-                    self._param.get_annual_state_cost(next_state)) * self._param.get_delta_t()
+        # cost and utility of this transition (including the treatment cost)
+        cost = self._transitionCosts[current_state.value][next_state.value]
+        utility = self._transitionUtilities[current_state.value][next_state.value]
 
-        # update utility
-        utility = 0.5*(self._param.get_annual_state_utility(current_state)+
-                       self._param.get_annual_state_utility(next_state)) * self._param.get_delta_t()
+        # update total discounted cost and utility (NOT corrected for the half-cycle effect)
+        self._totalDiscountedCost += cost * self._discountFactors[k]
+        self._totalDiscountedUtility += utility * self._discountFactors[k]
 
-        # treatment cost (incurred only in post-stroke state)
-        if current_state is P.HealthStats.POST_STROKE:
-            if next_state is [P.HealthStats.NON_STROKE_DEATH, P.HealthStats.STROKE_DEATH]:
-                cost += 0.5 * self._param.get_annual_treatment_cost() * self._param.get_delta_t()
-            else:
-                cost += 1 * self._param.get_annual_treatment_cost() * self._param.get_delta_t()
+    def stay(self, k, n_steps, state):
+        """ updates the discounted total cost and health utility when the patient stays in a state
+        for time steps k, ..., k+n_steps-1
+        """
 
-        # update total discounted cost and utility (NOT corrected for the half-cycle effect)
-        self._totalDiscountedCost += \
-            EconCls.pv(cost,self._param.get_adj_discount_rate(), k)
-        self._totalDiscountedUtility += \
-            EconCls.pv(utility,self._param.get_adj_discount_rate(), k)
+        discount = self._cumDiscountFactors[k + n_steps] - self._cumDiscountFactors[k]
+        self._totalDiscountedCost += self._transitionCosts[state.value][state.value] * discount
+        self._totalDiscountedUtility += self._transitionUtilities[state.value][state.value] * discount
 
     def get_total_discounted_cost(self):
         """ :returns total discounted cost"""
@@ -151,83 +231,612 @@ class PatientCostUtilityMonitor:
         return self._totalDiscountedUtility
 
 
+class ContinuousTimePatient:
+    def __init__(self, id, parameters, rng=None):
+        """ initiates a patient simulated in continuous time, jumping from one event to the next
+        :param id: ID of the patient
+        :param parameters: parameter object
+        :param rng: random number generator (if None, rndClasses.RNG(id) is used)
+        """
+
+        self._id = id
+        self._rng = rng
+        self._param = parameters
+        self._survivalTime = None
+        self._strokeCount = 0
+        self._totalDiscountedCost = 0
+        self._totalDiscountedUtility = 0
+
+    def simulate(self, sim_length):
+        """ simulate the patient over the specified simulation length by sampling the holding time in each state
+        and the next state directly from the transition rates """
+        # random number generator for this patient
+        if self._rng is None:
+            self._rng = rndClasses.RNG(self._id)
+
+        stroke_states = [P.HealthStats.MINOR_STROKE, P.HealthStats.MAJOR_STROKE, P.HealthStats.TIA]
+        death_states = [P.HealthStats.STROKE_DEATH, P.HealthStats.NON_STROKE_DEATH]
+
+        t = 0
+        state = self._param.get_initial_health_state()
+        while True:
+            # time of leaving the current state (or the end of simulation)
+            exit_rate = self._param.get_exit_rate(state)
+            if exit_rate > 0:
+                # exponential holding time by inversion (so that every sampling scheme applies)
+                t_next = min(t - math.log(1 - self._rng.random_sample())/exit_rate, sim_length)
+            else:
+                t_next = sim_length
+
+            # cost and utility accumulated while in the current state
+            self._accumulate(state, t, t_next)
+            if t_next >= sim_length:
+                return
+
+            # sample the next state
+            state = P.HealthStats(self._param.get_jump_sampler(state).sample(self._rng))
+            t = t_next
+
+            if state in stroke_states:
+                self._strokeCount += 1
+            elif state in death_states:
+                self._survivalTime = t
+                # the one-off cost of dying does not depend on the time step
+                self._totalDiscountedCost += self._param.get_death_cost(state) * self._discount_factor(t)
+                return
+
+    def _discount_factor(self, t):
+        return math.exp(-self._param.get_continuous_discount_rate() * t)
+
+    def _accumulate(self, state, t_start, t_end):
+        """ adds the continuously discounted cost and utility of staying in a state from t_start to t_end """
+
+        annual_cost = self._param.get_annual_state_cost(state)
+        if state is P.HealthStats.POST_STROKE:
+            annual_cost += self._param.get_annual_treatment_cost()
+        annual_utility = self._param.get_annual_state_utility(state)
+
+        # integral of exp(-rate * t) from t_start to t_end
+        rate = self._param.get_continuous_discount_rate()
+        if rate > 0:
+            duration = (self._discount_factor(t_start) - self._discount_factor(t_end)) / rate
+        else:
+            duration = t_end - t_start
+
+        self._totalDiscountedCost += annual_cost * duration
+        self._totalDiscountedUtility += annual_utility * duration
+
+    def get_survival_time(self):
+        """ returns the patient survival time (None if the patient is alive at the end of simulation) """
+        return self._survivalTime
+
+    def get_number_of_strokes(self):
+        return self._strokeCount
+
+    def get_total_discounted_cost(self):
+        return self._totalDiscountedCost
+
+    def get_total_discounted_utility(self):
+        return self._totalDiscountedUtility
+
+
+class AntitheticRNG:
+    def __init__(self, seed):
+        """ random number generator returning 1-u for each random number u of rndClasses.RNG(seed)
+        :param seed: seed of the generator whose random numbers are reflected
+        """
+        self._rng = rndClasses.RNG(seed)
+
+    def random_sample(self):
+        # keep the random number in [0, 1)
+        return min(1 - self._rng.random_sample(), _LARGEST_UNIFORM)
+
+
+class QuasiRandomRNG:
+    def __init__(self, seed, uniforms):
+        """ random number generator returning the coordinates of a (scrambled) quasi-random point,
+        followed by pseudo-random numbers once the coordinates are used up
+        :param seed: seed of the pseudo-random numbers
+        :param uniforms: coordinates of the quasi-random point
+        """
+        self._uniforms = uniforms
+        self._next = 0
+        self._rng = rndClasses.RNG(seed)
+
+    def random_sample(self):
+        if self._next < len(self._uniforms):
+            self._next += 1
+            return self._uniforms[self._next - 1]
+        return self._rng.random_sample()
+
+
+# largest float below 1
+_LARGEST_UNIFORM = float(np.nextafter(1, 0))
+
+# number of independently scrambled quasi-random sequences a cohort is split into
+N_QMC_REPLICATES = 8
+
+
+class Sampling(Enum):
+    """ schemes to generate the random numbers of patients """
+    PSEUDO_RANDOM = 0   # independent pseudo-random numbers for each patient
+    ANTITHETIC = 1      # patients 2m and 2m+1 use random numbers u and 1-u (only for the engines that sample
+                        # by inversion, Engine.SKIP_AHEAD and Engine.CONTINUOUS_TIME: with a draw at every time
+                        # step, the outcomes of a pair are not negatively correlated and the variance is not reduced)
+    QUASI_RANDOM = 2    # patients use points of scrambled Sobol sequences (N_QMC_REPLICATES of them; each should
+                        # have a power of 2 points to keep the balance of the sequences)
+
+
+def _get_block_size(sampling, pop_size):
+    """ :returns the number of consecutive patients whose outcomes are dependent under a sampling scheme
+    (block means are independent and identically distributed) """
+
+    if sampling == Sampling.ANTITHETIC:
+        block_size = 2
+    elif sampling == Sampling.QUASI_RANDOM:
+        block_size = pop_size // N_QMC_REPLICATES
+    else:
+        return 1
+
+    if pop_size % block_size != 0 or pop_size < 2*block_size:
+        raise ValueError('The population size {} cannot be split into blocks of {} patients '
+                         'for {}.'.format(pop_size, block_size, sampling))
+    return block_size
+
+
+def _create_rngs(sampling, cohort_id, pop_size, first, last, n_dims):
+    """ :returns random number generators of patients first, ..., last-1 of a cohort
+    (None means that the patient uses rndClasses.RNG(patient id))
+    :param n_dims: number of quasi-random coordinates per patient
+    """
+
+    if sampling == Sampling.ANTITHETIC:
+        # the second patient of each pair reflects the random numbers of the first
+        return [None if i % 2 == 0 else AntitheticRNG(cohort_id * pop_size + i - 1) for i in range(first, last)]
+
+    if sampling == Sampling.QUASI_RANDOM:
+        block_size = _get_block_size(sampling, pop_size)
+        rngs = []
+        i = first
+        while i < last:
+            # patients of this replicate are consecutive points of its scrambled sequence
+            replicate, point = divmod(i, block_size)
+            n_points = min(last - i, block_size - point)
+            sobol = qmc.Sobol(d=n_dims, scramble=True, seed=cohort_id * N_QMC_REPLICATES + replicate)
+            if point > 0:
+                sobol.fast_forward(point)
+            with warnings.catch_warnings():
+                # scipy warns about every draw whose size is not a power of 2, but shards draw consecutive
+                # segments of a replicate, whose balance only depends on its size (checked by Cohort)
+                warnings.simplefilter('ignore', UserWarning)
+                points = sobol.random(n_points)
+            for j, uniforms in enumerate(points.tolist()):
+                rngs.append(QuasiRandomRNG(cohort_id * pop_size + i + j, uniforms))
+            i += n_points
+        return rngs
+
+    return [None] * (last - first)
+
+
+class Engine(Enum):
+    """ simulation engines to simulate a cohort """
+    PATIENT = 0         # simulate patients one at a time
+    VECTORIZED = 1      # advance the states of all patients together
+    CONTINUOUS_TIME = 2     # simulate patients one at a time, from one event to the next
+    SKIP_AHEAD = 3      # simulate patients one at a time, jumping over time steps without a change of state
+
+
+def _create_patients(engine, sampling, cohort_id, therapy, pop_size, first, last, input_data=Data,
+                     record_paths=False):
+    """ :returns an iterator over patients first, ..., last-1 of a cohort, to be simulated by the selected engine
+    (patient i has id cohort_id * pop_size + i; record_paths is only available for discrete-time engines) """
+
+    param = P.get_parameters_fixed(therapy, input_data)
+    if engine == Engine.CONTINUOUS_TIME:
+        patient_class = ContinuousTimePatient
+    elif engine == Engine.SKIP_AHEAD:
+        patient_class = SkipAheadPatient
+    else:
+        patient_class = Patient
+
+    rngs = _create_rngs(sampling, cohort_id, pop_size, first, last, param.get_n_time_steps())
+    for i, rng in zip(range(first, last), rngs):
+        if record_paths:
+            yield patient_class(cohort_id * pop_size + i, param, rng, record_path=True)
+        else:
+            yield patient_class(cohort_id * pop_size + i, param, rng)
+
+
+def _simulate_shard(cohort_id, therapy, pop_size, first, last,
+                    engine=Engine.PATIENT, sampling=Sampling.PSEUDO_RANDOM, input_data=Data, record_paths=False):
+    """ simulate patients first, ..., last-1 of a cohort (used by processes of a pool)
+    :param first: first patient (must start a chunk of the cohort, see OnlineStats.get_chunk_size)
+    :returns arrays of patients' survival times (nan if alive), number of strokes, discounted costs and utilities,
+        the statistics (OnlineStats.OutcomeStats) of each chunk of these patients,
+        and the patients' Trajectories.StateTrajectories if record_paths is True (otherwise None)
+    """
+
+    outcomes = []
+    paths = []
+    for patient in _create_patients(engine, sampling, cohort_id, therapy, pop_size, first, last, input_data,
+                                    record_paths):
+        patient.simulate(input_data.SIM_LENGTH)
+        outcomes.append(_get_patient_outcome(patient))
+        if record_paths:
+            paths.append(patient.get_path())
+
+    outcome_arrays = _get_outcome_arrays(outcomes)
+    chunk_stats = OnlineStats.summarize_chunks(*outcome_arrays, _get_block_size(sampling, pop_size))
+    trajectories = Trajectories.StateTrajectories.from_paths(paths, therapy, input_data) if record_paths else None
+    return outcome_arrays, chunk_stats, trajectories
+
+
+def _get_patient_outcome(patient):
+    """ :returns (survival time, number of strokes, discounted cost, discounted utility) of a simulated patient """
+    return (patient.get_survival_time(), patient.get_number_of_strokes(),
+            patient.get_total_discounted_cost(), patient.get_total_discounted_utility())
+
+
+def _get_outcome_arrays(outcomes):
+    """ :returns arrays of patients' survival times (nan if alive), number of strokes, discounted costs and
+    utilities from an iterable of (survival time, number of strokes, discounted cost, discounted utility) """
+
+    survival_times, count_strokes, costs, utilities = [], [], [], []
+    for survival_time, count, cost, utility in outcomes:
+        survival_times.append(np.nan if survival_time is None else survival_time)
+        count_strokes.append(count)
+        costs.append(cost)
+        utilities.append(utility)
+
+    return np.array(survival_times, dtype=float), np.array(count_strokes, dtype=np.int64), \
+        np.array(costs, dtype=float), np.array(utilities, dtype=float)
+
+
+def _iterate_outcomes(outcomes):
+    """ :returns an iterator over (survival time, number of strokes, discounted cost, discounted utility)
+    of patients from arrays of their outcomes (survival time is None for patients who are still alive) """
+
+    survival_times, count_strokes, costs, utilities = outcomes
+    for survival_time, count, cost, utility in zip(
+            survival_times.tolist(), count_strokes.tolist(), costs.tolist(), utilities.tolist()):
+        yield (None if survival_time != survival_time else survival_time), count, cost, utility
+
+
 class Cohort:
-    def __init__(self, id, therapy):
+    def __init__(self, id, therapy, engine=Engine.PATIENT, sampling=Sampling.PSEUDO_RANDOM, input_data=Data,
+                 record_paths=False, horizons=None):
         """ create a cohort of patients
         :param id: an integer to specify the seed of the random number generator
+            (cohorts with the same id use common random numbers: patient i gets the same random stream)
+        :param therapy: selected therapy
+        :param engine: simulation engine (Engine.PATIENT, Engine.VECTORIZED, Engine.CONTINUOUS_TIME
+            or Engine.SKIP_AHEAD)
+        :param sampling: scheme to generate patients' random numbers (Sampling.ANTITHETIC is only available
+            for Engine.SKIP_AHEAD and Engine.CONTINUOUS_TIME, and Sampling.QUASI_RANDOM is not available for
+            the vectorized engine)
+        :param input_data: module (or object) with the model inputs (see P.build_input_data)
+        :param record_paths: set to True to record patients' health states at every time step, so that their
+            outcomes can be re-costed under new cost, utility or discount inputs (see get_trajectories;
+            not available for the continuous-time engine)
+        :param horizons: list of time horizons (years, at most the simulation length) at which outputs are also
+            reported from the same run (see CohortOutputs.get_horizon_outputs; paths are recorded for this)
         """
-        self._initial_pop_size = Data.POP_SIZE
-        self._patients = []      # list of patients
-
-        # populate the cohort
-        for i in range(self._initial_pop_size):
-            # create a new patient (use id * pop_size + i as patient id)
-            patient = Patient(id * self._initial_pop_size + i, P.ParametersFixed(therapy))
-            # add the patient to the cohort
-            self._patients.append(patient)
+        self._id = id
+        self._therapy = therapy
+        self._engine = engine
+        self._sampling = sampling
+        self._inputData = input_data
+        self._initial_pop_size = input_data.POP_SIZE
+        self._blockSize = _get_block_size(sampling, self._initial_pop_size)
+        if engine == Engine.VECTORIZED and sampling == Sampling.QUASI_RANDOM:
+            raise ValueError('Quasi-random sampling is not available for the vectorized engine.')
+        if engine in (Engine.PATIENT, Engine.VECTORIZED) and sampling == Sampling.ANTITHETIC:
+            raise ValueError('Antithetic sampling does not reduce the variance of the {} engine; '
+                             'use Engine.SKIP_AHEAD or Engine.CONTINUOUS_TIME.'.format(engine.name))
+        if sampling == Sampling.QUASI_RANDOM and self._blockSize & (self._blockSize - 1) != 0:
+            warnings.warn('Each of the {} quasi-random replicates has {} points, which is not a power of 2, so '
+                          'the balance properties of Sobol sequences are lost (use a population size of {} '
+                          'times a power of 2).'.format(N_QMC_REPLICATES, self._blockSize, N_QMC_REPLICATES),
+                          UserWarning)
+        self._horizons = [] if horizons is None else list(horizons)
+        if any(horizon > input_data.SIM_LENGTH for horizon in self._horizons):
+            raise ValueError('Horizons cannot be longer than the simulation length.')
+        self._recordPaths = record_paths or len(self._horizons) > 0
+        if engine == Engine.CONTINUOUS_TIME and self._recordPaths:
+            raise ValueError('Recording paths needs a discrete-time engine.')
+        self._trajectories = None    # patients' recorded health states
+        self._patients = []      # list of patients (populated when patients are simulated in this process)
+        self._outcomes = None    # patients' outcomes unless they are read from Patient objects
+        self._outcomeStats = None    # summary statistics of patients' outcomes
 
-    def simulate(self):
+    def simulate(self, n_workers=1, streaming=False, use_cache=True):
         """ simulate the cohort of patients over the specified number of time-steps
+        :param n_workers: number of processes to shard patients across (None to use all cores);
+            patients keep their seeds, so the outputs are identical to simulating them in this process
+        :param streaming: set to True to create and simulate patients in small chunks without keeping Patient
+            objects, writing their outcomes to memory-mapped columns (in the cache, or in a temporary directory
+            removed with this cohort when the cache is not used), so that memory does not grow with the
+            population size (outputs are identical to the default mode; needs n_workers=1 and an engine that
+            simulates patients one at a time)
+        :param use_cache: set to False to ignore the on-disk result cache in InputData.CACHE_DIR
+            (a cohort loaded from the cache has the same outputs but no Patient objects)
         :returns outputs from simulating this cohort
         """
 
-        # simulate all patients
-        for patient in self._patients:
-            patient.simulate(Data.SIM_LENGTH)
+        if streaming and self._recordPaths:
+            raise ValueError('Paths cannot be recorded when patients are streamed.')
+        if streaming and n_workers != 1:
+            raise ValueError('Patients are streamed in this process, so streaming needs n_workers=1.')
+        if streaming and self._engine == Engine.VECTORIZED:
+            raise ValueError('Streaming needs an engine that simulates patients one at a time.')
+
+        self._outcomeStats = None
+
+        # load the outcomes if this cohort was already simulated with the same inputs and code
+        # (the cache does not store paths, so a cohort that records them is always simulated)
+        cache_dir = self._inputData.CACHE_DIR if use_cache else None
+        key = None
+        if cache_dir is not None:
+            key = ResultCache.get_cohort_key(self._id, self._therapy, self._engine, self._sampling, self._inputData)
+            cached_outcomes = None if self._recordPaths else ResultCache.load_outcomes(cache_dir, key)
+            if cached_outcomes is not None:
+                self._outcomes = cached_outcomes.get_columns()
+                return CohortOutputs(self)
+
+        if self._engine == Engine.VECTORIZED:
+            self._simulate_vectorized(self._inputData.SIM_LENGTH)
+        elif streaming:
+            self._simulate_streaming(cache_dir, key)
+            # the outcomes are already on disk (in the cache when it is used)
+            return CohortOutputs(self)
+        elif n_workers == 1:
+            # populate the cohort (use id * pop_size + i as patient id)
+            self._patients = list(_create_patients(self._engine, self._sampling, self._id, self._therapy,
+                                                   self._initial_pop_size, 0, self._initial_pop_size,
+                                                   self._inputData, self._recordPaths))
+
+            # simulate all patients, summarizing the outcomes of each chunk of patients as it finishes
+            chunk_size = OnlineStats.get_chunk_size(self._blockSize)
+            self._outcomeStats = OnlineStats.OutcomeStats(self._blockSize)
+            for first in range(0, self._initial_pop_size, chunk_size):
+                chunk = self._patients[first:first + chunk_size]
+                for patient in chunk:
+                    patient.simulate(self._inputData.SIM_LENGTH)
+                for stats in OnlineStats.summarize_chunks(
+                        *_get_outcome_arrays(_get_patient_outcome(patient) for patient in chunk), self._blockSize):
+                    self._outcomeStats.merge(stats)
+            if self._recordPaths:
+                self._trajectories = Trajectories.StateTrajectories.from_paths(
+                    [patient.get_path() for patient in self._patients], self._therapy, self._inputData,
+                    self._blockSize)
+        else:
+            self._simulate_in_parallel(n_workers)
+
+        if cache_dir is not None:
+            ResultCache.save_outcomes(cache_dir, key, self.get_outcome_columns())
 
         # return the cohort outputs
         return CohortOutputs(self)
 
+    def _simulate_in_parallel(self, n_workers):
+        """ shard the range of patients across a pool of processes and merge the outcomes of shards in order
+        :param n_workers: number of processes (None to use all cores)
+        """
+
+        if n_workers is None:
+            n_workers = os.cpu_count()
+
+        # use several shards per process to balance the load; shards are made of whole chunks of patients,
+        # so that the statistics of their chunks are those of a serial simulation
+        chunk_size = OnlineStats.get_chunk_size(self._blockSize)
+        n_chunks = -(-self._initial_pop_size // chunk_size)
+        n_shards = min(n_chunks, 4*n_workers)
+        bounds = [min(int(i) * chunk_size, self._initial_pop_size)
+                  for i in np.linspace(0, n_chunks, n_shards + 1).astype(int)]
+
+        # modules cannot be sent to other processes, so send a copy of the model inputs
+        input_data = P.build_input_data(self._inputData)
+
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            shards = list(executor.map(
+                _simulate_shard,
+                [self._id]*n_shards, [self._therapy]*n_shards, [self._initial_pop_size]*n_shards,
+                bounds[:-1], bounds[1:], [self._engine]*n_shards, [self._sampling]*n_shards,
+                [input_data]*n_shards, [self._recordPaths]*n_shards))
+
+        self._outcomes = tuple(np.concatenate(outcome) for outcome in zip(*(shard[0] for shard in shards)))
+        self._outcomeStats = OnlineStats.merge_chunks(
+            [stats for shard in shards for stats in shard[1]], self._blockSize)
+        if self._recordPaths:
+            self._trajectories = Trajectories.StateTrajectories.concatenate(
+                [shard[2] for shard in shards], self._blockSize)
+
+    def _simulate_vectorized(self, sim_length):
+        """ simulate all patients together by keeping the current states of the cohort in one array
+        and advancing every live patient at each time step
+        :param sim_length: simulation length
+        """
+
+        param = P.get_parameters_fixed(self._therapy, self._inputData)
+        delta_t = param.get_delta_t()
+        n = self._initial_pop_size
+        rng = rndClasses.RNG(self._id)
+        discount_factors = param.get_discount_factors()
+
+        # cumulative transition probabilities out of each state
+        cum_prob = param.get_cumulative_prob_matrix()
+
+        # cost and utility of each transition, and the states with special rules
+        cost_matrix = np.array(param.get_transition_cost_matrix())
+        utility_matrix = np.array(param.get_transition_utility_matrix())
+        stroke_states = [P.HealthStats.MINOR_STROKE.value, P.HealthStats.MAJOR_STROKE.value, P.HealthStats.TIA.value]
+        death_states = [P.HealthStats.STROKE_DEATH.value, P.HealthStats.NON_STROKE_DEATH.value]
+
+        current_states = np.full(n, param.get_initial_health_state().value, dtype=np.int8)
+        survival_times = np.full(n, np.nan)
+        count_strokes = np.zeros(n, dtype=np.int64)
+        costs = np.zeros(n)
+        utilities = np.zeros(n)
+        alive = np.arange(n)    # indices of patients who are alive
+
+        # health states of patients at each time point and the number of time points of each patient
+        state_history = [current_states.copy()] if self._recordPaths else None
+        n_points = np.ones(n, dtype=np.int64)
+
+        k = 0
+        while len(alive) > 0 and k*delta_t < sim_length:
+            current = current_states[alive]
+
+            # sample the next state of each live patient from the row of its current state
+            # (one random number is drawn for every patient so that patient i uses the same random numbers
+            # in cohorts with the same id, i.e. common random numbers across therapies)
+            rnd = rng.random_sample(n)[alive]
+            next_states = np.empty(len(alive), dtype=np.int8)
+            for s in np.unique(current):
+                in_s = current == s
+                next_states[in_s] = np.searchsorted(cum_prob[s], rnd[in_s], side='right')
+
+            # record survival times of patients who die in this time step
+            died = np.isin(next_states, death_states)
+            survival_times[alive[died]] = (0.5+k) * delta_t
+
+            # update the number of strokes experienced
+            count_strokes[alive] += np.isin(current, stroke_states)
+
+            # cost and utility of this time step
+            costs[alive] += cost_matrix[current, next_states] * discount_factors[k]
+            utilities[alive] += utility_matrix[current, next_states] * discount_factors[k]
+
+            # update current health states and keep only patients who are still alive
+            current_states[alive] = next_states
+            if self._recordPaths:
+                state_history.append(current_states.copy())
+                n_points[alive] += 1
+            alive = alive[~died]
+            k += 1
+
+        self._outcomes = (survival_times, count_strokes, costs, utilities)
+        if self._recordPaths:
+            self._trajectories = Trajectories.StateTrajectories.from_state_matrix(
+                np.array(state_history).T, n_points, self._therapy, self._inputData, self._blockSize)
+
+    def _simulate_streaming(self, cache_dir=None, key=None):
+        """ simulate patients in chunks (see OnlineStats.get_chunk_size), discarding them once their outcomes are
+        written to memory-mapped columns and the statistics of the chunk are merged
+        :param cache_dir: directory of the cache to write the outcomes to (None to write them to a temporary
+            directory removed with this cohort; open memory maps stay readable after the files are removed)
+        :param key: hash of the cohort in the cache (see ResultCache.get_cohort_key)
+        """
+
+        if cache_dir is None:
+            directory = tempfile.mkdtemp(prefix='cohort_')
+            weakref.finalize(self, shutil.rmtree, directory, ignore_errors=True)
+        else:
+            directory = ResultCache.create_entry(cache_dir)
+
+        chunk_size = OnlineStats.get_chunk_size(self._blockSize)
+        self._outcomeStats = OnlineStats.OutcomeStats(self._blockSize)
+        writer = OutcomeStore.OutcomeWriter(directory, self._initial_pop_size, self._blockSize)
+        for first in range(0, self._initial_pop_size, chunk_size):
+            last = min(first + chunk_size, self._initial_pop_size)
+            outcomes, chunk_stats, _ = _simulate_shard(self._id, self._therapy, self._initial_pop_size, first, last,
+                                                       self._engine, self._sampling, self._inputData)
+            writer.write(*outcomes)
+            for stats in chunk_stats:
+                self._outcomeStats.merge(stats)
+        outcomes = writer.close()
+
+        if cache_dir is not None:
+            ResultCache.store_entry(cache_dir, key, directory)
+            outcomes = OutcomeStore.PatientOutcomes.load(os.path.join(cache_dir, key))
+        self._outcomes = outcomes.get_columns()
+
     def get_initial_pop_size(self):
         return self._initial_pop_size
 
+    def get_block_size(self):
+        """ :returns the number of consecutive patients whose outcomes are dependent under the sampling scheme """
+        return self._blockSize
+
+    def get_horizon_outcomes(self):
+        """ :returns dictionary of patients' outcomes (OutcomeStore.PatientOutcomes) at each requested horizon """
+        return {horizon: self._trajectories.get_patient_outcomes(horizon=horizon) for horizon in self._horizons}
+
+    def get_trajectories(self):
+        """ :returns patients' recorded health states (Trajectories.StateTrajectories), whose
+        get_patient_outcomes(input_data) re-costs the cohort, or None if paths were not recorded """
+        return self._trajectories
+
     def get_patients(self):
         return self._patients
 
+    def get_patient_outcomes(self):
+        """ :returns an iterator over (survival time, number of strokes, discounted cost, discounted utility)
+        of simulated patients (survival time is None for patients who are still alive) """
+
+        if self._outcomes is None:
+            for patient in self._patients:
+                yield _get_patient_outcome(patient)
+        else:
+            yield from _iterate_outcomes(self._outcomes)
+
+    def get_outcome_columns(self):
+        """ :returns the outcomes of simulated patients in typed columns (OutcomeStore.PatientOutcomes) """
+
+        if self._outcomes is None:
+            outcomes = _get_outcome_arrays(self.get_patient_outcomes())
+        else:
+            outcomes = self._outcomes
+        return OutcomeStore.PatientOutcomes(*outcomes, block_size=self._blockSize)
+
+    def get_outcome_stats(self):
+        """ :returns summary statistics of patients' outcomes (OnlineStats.OutcomeStats), merged in order from the
+        statistics of chunks on a fixed grid of patients as the chunks finish (or from the outcome columns when the
+        cohort was simulated all at once or loaded from the cache), so that they do not depend on how the cohort
+        was simulated """
+        if self._outcomeStats is None:
+            self._outcomeStats = self.get_outcome_columns().get_outcome_stats()
+        return self._outcomeStats
+
 
 class CohortOutputs:
     def __init__(self, simulated_cohort):
         """ extracts outputs from a simulated cohort
-        :param simulated_cohort: a cohort after being simulated
+        :param simulated_cohort: a cohort after being simulated, or patients' outcomes
+            (OutcomeStore.PatientOutcomes, e.g. memory-mapped from files)
         """
 
-        self._survivalTimes = []        # patients' survival times
-        self._times_to_Stroke = []      # patients' times to stroke
-        self._count_strokes = []        # patients' number of strokes
-        self._costs = []                # patients' discounted total costs
-        self._utilities = []            # patients' discounted total utilities
-
-        # survival curve
-        self._survivalCurve = \
-            PathCls.SamplePathBatchUpdate('Population size over time', id, simulated_cohort.get_initial_pop_size())
+        # outputs at the requested time horizons shorter than the simulation length
+        self._horizonOutputs = {horizon: CohortOutputs(outcomes)
+                                for horizon, outcomes in simulated_cohort.get_horizon_outcomes().items()}
 
-        # find patients' survival times
-        for patient in simulated_cohort.get_patients():
+        # patients' outcomes in typed columns (statistics read the columns without copying them, so outputs of
+        # a streamed or cached cohort only hold memory maps)
+        self._outcomeColumns = simulated_cohort.get_outcome_columns()
+        self._count_strokes, self._costs, self._utilities = self._outcomeColumns.get_columns()[1:]
 
-            # get the patient survival time
-            survival_time = patient.get_survival_time()
-            if not (survival_time is None):
-                self._survivalTimes.append(survival_time)           # store the survival time of this patient
-                self._survivalCurve.record(survival_time, -1)       # update the survival curve
+        # Kaplan-Meier survival curve (calculated when it is first requested)
+        self._survivalCurve = None
 
-            count_strokes = patient.get_number_of_strokes()
-            self._count_strokes.append(count_strokes)
+        # summary statistics accumulated in chunks of patients (over means of blocks of dependent patients when a variance
+        # reduction sampling scheme is used, so that confidence intervals account for the dependence)
+        self._outcomeStats = simulated_cohort.get_outcome_stats()
+        self._sumStat_survivalTime = self._outcomeStats.get_sumStat_survival_times()
+        self._sumState_number_strokes = self._outcomeStats.get_sumStat_count_strokes()
+        self._sumStat_cost = self._outcomeStats.get_sumStat_discounted_cost()
+        self._sumStat_utility = self._outcomeStats.get_sumStat_discounted_utility()
 
-            # cost and utility
-            self._costs.append(patient.get_total_discounted_cost())
-            self._utilities.append(patient.get_total_discounted_utility())
-
-        # summary statistics
-        self._sumStat_survivalTime = StatCls.SummaryStat('Patient survival time', self._survivalTimes)
-        self._sumState_number_strokes = StatCls.SummaryStat('Time until stroke', self._count_strokes)
-        self._sumStat_cost = StatCls.SummaryStat('Patient discounted cost', self._costs)
-        self._sumStat_utility = StatCls.SummaryStat('Patient discounted utility', self._utilities)
+        # effective variance reduction with respect to independent patients
+        self._varianceReduction_cost = self._outcomeStats.get_variance_reduction_cost()
+        self._varianceReduction_utility = self._outcomeStats.get_variance_reduction_utility()
 
     def get_if_developed_stroke(self):
         return self._count_strokes
 
     def get_survival_times(self):
-        return self._survivalTimes
+        """ :returns the survival times of patients who died """
+        survival_times = self._outcomeColumns.get_survival_times()
+        return survival_times[~np.isnan(survival_times)]
 
     def get_costs(self):
         return self._costs
@@ -235,12 +844,292 @@ class CohortOutputs:
     def get_utilities(self):
         return  self._utilities
 
+    def get_outcome_columns(self):
+        """ :returns patients' outcomes in typed columns (OutcomeStore.PatientOutcomes), which can be saved """
+        return self._outcomeColumns
+
+    def get_outcome_stats(self):
+        """ :returns the summary statistics of patients' outcomes (OnlineStats.OutcomeStats), which also
+        give the covariance of discounted costs and utilities """
+        return self._outcomeStats
+
+    def get_horizons(self):
+        """ :returns the time horizons at which outputs are available besides the simulation length """
+        return list(self._horizonOutputs)
+
+    def get_horizon_outputs(self, horizon):
+        """ :returns the outputs (CohortOutputs) of the cohort at a requested time horizon, identical to those of
+        a simulation of this length with the same random numbers """
+        return self._horizonOutputs[horizon]
+
     def get_sumStat_survival_times(self):
         return self._sumStat_survivalTime
 
+    def get_survival_curve(self):
+        """ :returns the Kaplan-Meier survival curve (KaplanMeier.KaplanMeierCurve), with the survival
+        probabilities and their Greenwood confidence bands (to_sample_path() gives the number of patients alive
+        over time for PathCls.graph_sample_path(s))
+        (patients alive at the end of the simulation are censored after all deaths) """
+        if self._survivalCurve is None:
+            self._survivalCurve = KaplanMeier.KaplanMeierCurve(
+                'Population size over time', self._outcomeColumns.get_survival_times())
+        return self._survivalCurve
+
+    def get_sumStat_count_strokes(self):
+        return self._sumState_number_strokes
+
+    def get_sumStat_discounted_cost(self):
+        return self._sumStat_cost
+
+    def get_sumStat_discounted_utility(self):
+        return self._sumStat_utility
+
+    def get_variance_reduction_cost(self):
+        """ :returns the variance of the mean discounted cost with independent patients
+        divided by its variance under the sampling scheme used """
+        return self._varianceReduction_cost
+
+    def get_variance_reduction_utility(self):
+        """ :returns the variance of the mean discounted utility with independent patients
+        divided by its variance under the sampling scheme used """
+        return self._varianceReduction_utility
+
+
+class PrecisionMetric(Enum):
+    """ outcomes whose confidence intervals can be used to stop a sequential simulation """
+    COST = 0        # mean discounted cost of each therapy
+    UTILITY = 1     # mean discounted utility of each therapy
+    NMB = 2         # incremental net monetary benefit of each therapy with respect to the first one
+
+
+class SequentialCohorts:
+    def __init__(self, id, therapies, metric, tolerance, wtp=0, batch_size=500, max_pop_size=1000000,
+                 engine=Engine.PATIENT):
+        """ cohorts of the selected therapies that are simulated in batches of patients until the
+        t-confidence intervals of the selected metric are narrow enough
+        :param id: an integer to specify the seed of random number generators (patient i of every therapy uses
+            the id * max_pop_size + i as seed, so therapies are compared with common random numbers)
+        :param therapies: list of therapies (the first one is the reference for PrecisionMetric.NMB)
+        :param metric: PrecisionMetric to target
+        :param tolerance: largest acceptable half-width of confidence intervals
+        :param wtp: willingness-to-pay for one additional QALY (for PrecisionMetric.NMB)
+        :param batch_size: number of patients added to each cohort between checks
+        :param max_pop_size: largest number of patients in each cohort
+        :param engine: simulation engine (any engine that simulates patients one at a time)
+        """
+        if engine == Engine.VECTORIZED:
+            raise ValueError('Sequential simulation needs an engine that simulates patients one at a time.')
+        if metric == PrecisionMetric.NMB and len(therapies) < 2:
+            raise ValueError('The incremental net monetary benefit needs at least two therapies.')
+
+        self._id = id
+        self._therapies = therapies
+        self._metric = metric
+        self._tolerance = tolerance
+        self._wtp = wtp
+        self._batchSize = batch_size
+        self._maxPopSize = max_pop_size
+        self._engine = engine
+        self._popSize = 0
+        self._halfWidths = []
+
+    def simulate(self, alpha=Data.ALPHA):
+        """ simulate batches of patients until the half-widths of the (1-alpha) t-confidence intervals
+        of the selected metric are at most the tolerance, or the largest population size is reached
+        :returns list of outputs from simulating the cohort of each therapy
+        """
+
+        # outcomes of each batch, and summary statistics merged batch by batch
+        shards = [[] for therapy in self._therapies]
+        outcome_stats = [OnlineStats.OutcomeStats() for therapy in self._therapies]
+        nmb_stats = [OnlineStats.RunningStat('Incremental net monetary benefit') for therapy in self._therapies[1:]]
+        while True:
+            first = self._popSize
+            last = min(first + self._batchSize, self._maxPopSize)
+            for therapy, therapy_shards, stats in zip(self._therapies, shards, outcome_stats):
+                outcomes, _, _ = _simulate_shard(self._id, therapy, self._maxPopSize, first, last, self._engine)
+                therapy_shards.append(outcomes)
+                stats.record_arrays(*outcomes)
+            self._popSize = last
+
+            # incremental net monetary benefit of patient i (paired by common random numbers)
+            _, _, ref_costs, ref_utilities = shards[0][-1]
+            for therapy_shards, stats in zip(shards[1:], nmb_stats):
+                _, _, costs, utilities = therapy_shards[-1]
+                stats.record_array(self._wtp * (utilities - ref_utilities) - (costs - ref_costs))
+
+            self._halfWidths = [(ci[1] - ci[0])/2 for ci in
+                                (stat.get_t_CI(alpha=alpha)
+                                 for stat in self._get_metric_stats(outcome_stats, nmb_stats))]
+
+            if max(self._halfWidths) <= self._tolerance or self._popSize == self._maxPopSize:
+                break
+
+        return [CohortOutputs(OutcomeStore.PatientOutcomes(
+            *(np.concatenate(outcome) for outcome in zip(*therapy_shards)))) for therapy_shards in shards]
+
+    def _get_metric_stats(self, outcome_stats, nmb_stats):
+        """ :returns summary statistics of the selected metric from the statistics of the outcomes of each
+        therapy and of the incremental net monetary benefit of each therapy after the first """
+
+        if self._metric == PrecisionMetric.COST:
+            return [stats.get_sumStat_discounted_cost() for stats in outcome_stats]
+        if self._metric == PrecisionMetric.UTILITY:
+            return [stats.get_sumStat_discounted_utility() for stats in outcome_stats]
+        return nmb_stats
+
+    def get_pop_size(self):
+        """ :returns the number of patients simulated in each cohort """
+        return self._popSize
+
+    def get_half_widths(self):
+        """ :returns the half-widths of the confidence intervals of the selected metric at stopping """
+        return self._halfWidths
+
+    def get_if_precise(self):
+        """ :returns if the tolerance was reached before the largest population size """
+        return max(self._halfWidths) <= self._tolerance
+
+
+class ExpectedValue:
+    def __init__(self, name, value):
+        """ an expected value calculated without Monte Carlo error, with the same interface as StatCls.SummaryStat
+        :param name: name of this outcome
+        :param value: expected value
+        """
+        self.name = name
+        self._value = value
+
+    def get_mean(self):
+        return self._value
+
+    def get_t_CI(self, alpha):
+        """ :returns a zero-width interval since the expected value is exact """
+        return [self._value, self._value]
+
+    def get_PI(self, alpha):
+        return [self._value, self._value]
+
+
+class CohortTrace:
+    def __init__(self, therapy, parameters=None, input_data=Data):
+        """ create a deterministic cohort-trace model that propagates the expected
+        distribution of the cohort over health states through the transition probability matrix
+        :param therapy: selected therapy
+        :param parameters: parameter object (if None, the shared parameters of the therapy are used)
+        :param input_data: module (or object) with the model inputs
+        """
+        self._therapy = therapy
+        self._param = P.get_parameters_fixed(therapy, input_data) if parameters is None else parameters
+        self._initial_pop_size = input_data.POP_SIZE
+
+    def simulate(self):
+        """ calculate the expected state occupancy, costs and utilities over the specified number of time-steps
+        :returns outputs of this cohort trace
+        """
+
+        param = self._param
+        states = list(P.HealthStats)
+        prob_matrix = np.array(param.get_transition_prob_matrix(), dtype=float)
+        discount_factors = np.array(param.get_discount_factors())
+
+        # cost and utility of each transition, and the states with special rules
+        cost_matrix = np.array(param.get_transition_cost_matrix())
+        utility_matrix = np.array(param.get_transition_utility_matrix())
+        stroke_states = [P.HealthStats.MINOR_STROKE.value, P.HealthStats.MAJOR_STROKE.value, P.HealthStats.TIA.value]
+        death_states = [P.HealthStats.STROKE_DEATH.value, P.HealthStats.NON_STROKE_DEATH.value]
+
+        # expected cost, utility and probability of dying in a time step for a patient in each state
+        # (dead patients are no longer followed)
+        alive = np.ones(len(states))
+        alive[death_states] = 0
+        expected_costs = np.sum(prob_matrix * cost_matrix, axis=1) * alive
+        expected_utilities = np.sum(prob_matrix * utility_matrix, axis=1) * alive
+        prob_deaths = np.sum(prob_matrix[:, death_states], axis=1) * alive
+
+        # the cohort starts in the initial health state
+        occupancy = np.zeros(len(states))
+        occupancy[param.get_initial_health_state().value] = 1
+
+        trace = [occupancy]
+        for k in range(param.get_n_time_steps()):
+            occupancy = occupancy @ prob_matrix
+            trace.append(occupancy)
+        trace = np.array(trace)
+
+        # expected outcomes of each time step from the occupancy at its start
+        start = trace[:-1]
+        costs = start @ expected_costs * discount_factors
+        utilities = start @ expected_utilities * discount_factors
+        deaths = start @ prob_deaths
+        strokes = start[:, stroke_states].sum(axis=1)
+
+        return CohortTraceOutputs(self, trace, costs, utilities, deaths, strokes)
+
+    def get_initial_pop_size(self):
+        return self._initial_pop_size
+
+    def get_delta_t(self):
+        return self._param.get_delta_t()
+
+
+class CohortTraceOutputs:
+    def __init__(self, cohort_trace, trace, costs, utilities, deaths, strokes):
+        """ expected outputs of a cohort trace, per time step and in total
+        :param cohort_trace: the cohort trace after being simulated
+        :param trace: expected proportion of the cohort in each health state at the start of each time step
+        :param costs: expected discounted cost per patient in each time step
+        :param utilities: expected discounted utility per patient in each time step
+        :param deaths: expected proportion of the cohort dying in each time step
+        :param strokes: expected number of strokes per patient counted in each time step
+        """
+
+        self._trace = trace
+        self._costs = costs
+        self._utilities = utilities
+        self._deaths = deaths
+        self._strokes = strokes
+
+        delta_t = cohort_trace.get_delta_t()
+        times = (0.5 + np.arange(len(deaths))) * delta_t
+
+        # survival curve (expected number of alive patients)
+        pop_size = cohort_trace.get_initial_pop_size()
+        self._survivalCurve = PathCls.SamplePathBatchUpdate('Population size over time', id, pop_size)
+        for time, death in zip(times, deaths):
+            if death > 0:
+                self._survivalCurve.record(time, -death * pop_size)
+
+        # expected outcomes (survival time is among patients who die during the simulation, as in CohortOutputs)
+        prob_death = deaths.sum()
+        self._sumStat_survivalTime = ExpectedValue(
+            'Patient survival time', np.dot(times, deaths)/prob_death if prob_death > 0 else np.nan)
+        self._sumState_number_strokes = ExpectedValue('Time until stroke', strokes.sum())
+        self._sumStat_cost = ExpectedValue('Patient discounted cost', costs.sum())
+        self._sumStat_utility = ExpectedValue('Patient discounted utility', utilities.sum())
+
+    def get_trace(self):
+        """ :returns expected proportion of the cohort in each health state at the start of each time step """
+        return self._trace
+
+    def get_trace_costs(self):
+        return self._costs
+
+    def get_trace_utilities(self):
+        return self._utilities
+
+    def get_trace_deaths(self):
+        return self._deaths
+
+    def get_trace_strokes(self):
+        return self._strokes
+
     def get_survival_curve(self):
         return self._survivalCurve
 
+    def get_sumStat_survival_times(self):
+        return self._sumStat_survivalTime
+
     def get_sumStat_count_strokes(self):
         return self._sumState_number_strokes
 
@@ -0,0 +1,221 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+import re
+import numpy as np
+import ParameterClasses as P
+import MarkovModel as MarkovCls
+import InputData as Data
+
+
+# inputs varied in one-way sensitivity analysis (elements of lists are named as ANNUAL_STATE_COST[1])
+ONE_WAY_INPUTS = P.RATE_INPUTS + ['p'] + [name for names in P.SEVERITY_SPLIT_INPUTS for name in names] \
+    + ['ANNUAL_STATE_COST[{}]'.format(state.value) for state in P.HealthStats] \
+    + ['ANNUAL_STATE_UTILITY[{}]'.format(state.value) for state in P.HealthStats] \
+    + P.DRUG_COST_INPUTS
+
+# inputs that cannot be larger than 1
+_PROBABILITY_INPUTS = ['p'] + [name for names in P.SEVERITY_SPLIT_INPUTS for name in names] \
+    + ['ANNUAL_STATE_UTILITY[{}]'.format(state.value) for state in P.HealthStats]
+
+
+def get_input_value(input_data, name):
+    """ :returns the value of an input, where elements of lists are named as ANNUAL_STATE_COST[1]
+    :param input_data: module (or object) with the model inputs
+    :param name: name of the input
+    """
+    match = re.fullmatch(r'(\w+)\[(\d+)\]', name)
+    if match:
+        return getattr(input_data, match.group(1))[int(match.group(2))]
+    return getattr(input_data, name)
+
+
+def get_input_overlay(input_data, name, value):
+    """ :returns the dictionary of new values to pass to P.build_input_data to set an input
+    (an element of a list is set in a copy of the list)
+    :param input_data: module (or object) with the model inputs
+    :param name: name of the input, e.g. g or ANNUAL_STATE_COST[1]
+    :param value: new value of the input
+    """
+    match = re.fullmatch(r'(\w+)\[(\d+)\]', name)
+    if match:
+        values = list(getattr(input_data, match.group(1)))
+        values[int(match.group(2))] = value
+        return {match.group(1): values}
+    return {name: value}
+
+
+def _simulate_arms(arms, engine, cohort_id):
+    """ simulate the cohorts of (therapy, input data) pairs (used by processes of a pool)
+    :returns list of (expected discounted cost, expected discounted utility) of each cohort
+    """
+
+    outcomes = []
+    for therapy, input_data in arms:
+        if engine is None:
+            outputs = MarkovCls.CohortTrace(therapy, input_data=input_data).simulate()
+        else:
+            outputs = MarkovCls.Cohort(cohort_id, therapy, engine, input_data=input_data).simulate()
+        outcomes.append((outputs.get_sumStat_discounted_cost().get_mean(),
+                         outputs.get_sumStat_discounted_utility().get_mean()))
+    return outcomes
+
+
+class OneWaySensitivity:
+    def __init__(self, therapy, ref_therapy=P.Therapies.WARFARIN, wtp=Data.WTP, bounds=None,
+                 engine=None, cohort_id=1, input_data=Data):
+        """ one-way (tornado) sensitivity analysis of the comparison of a therapy with a reference therapy:
+        each input is set to its low and then its high bound while the other inputs keep their base values
+        :param therapy: therapy to evaluate
+        :param ref_therapy: reference therapy
+        :param wtp: willingness-to-pay for one additional QALY
+        :param bounds: dictionary of (low, high) bounds of inputs (inputs in ONE_WAY_INPUTS that are
+            not in this dictionary are varied by InputData.ONE_WAY_RANGE)
+        :param engine: simulation engine of cohorts (None to use the deterministic cohort trace)
+        :param cohort_id: id of all cohorts (so that they are compared with common random numbers)
+        :param input_data: module (or object) with the base model inputs
+        """
+        self._therapies = [ref_therapy, therapy]
+        self._wtp = wtp
+        self._engine = engine
+        self._cohortID = cohort_id
+        self._inputData = input_data
+
+        self._bounds = {}
+        for name in ONE_WAY_INPUTS:
+            value = get_input_value(input_data, name)
+            low, high = value*(1 - input_data.ONE_WAY_RANGE), value*(1 + input_data.ONE_WAY_RANGE)
+            if name in _PROBABILITY_INPUTS:
+                high = min(high, 1.0)
+            self._bounds[name] = (low, high)
+        if bounds is not None:
+            self._bounds.update(bounds)
+
+    def simulate(self, n_workers=1):
+        """ simulate the base case and the low and high value of every input; only cohorts of therapies
+        whose inputs change are simulated again, and each distinct cohort is simulated once
+        :param n_workers: number of processes to simulate cohorts (None to use all cores)
+        :returns outputs of this one-way sensitivity analysis
+        """
+
+        # input data of the base case and of the low and high value of each input that has a range
+        names = [name for name, (low, high) in self._bounds.items() if low != high]
+        scenarios = [P.build_input_data(self._inputData)]
+        for name in names:
+            for value in self._bounds[name]:
+                scenarios.append(P.build_input_data(
+                    self._inputData, **get_input_overlay(self._inputData, name, value)))
+
+        # distinct cohorts to simulate (keyed by the inputs of their therapy)
+        arms = {}
+        keys = []
+        for input_data in scenarios:
+            scenario_keys = []
+            for therapy in self._therapies:
+                key = P.get_parameters_key(therapy, input_data)
+                arms.setdefault(key, (therapy, input_data))
+                scenario_keys.append(key)
+            keys.append(scenario_keys)
+
+        arm_list = list(arms.values())
+        if n_workers == 1:
+            outcomes = _simulate_arms(arm_list, self._engine, self._cohortID)
+        else:
+            if n_workers is None:
+                n_workers = os.cpu_count()
+            n_shards = min(len(arm_list), 4*n_workers)
+            bounds = np.linspace(0, len(arm_list), n_shards + 1).astype(int).tolist()
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                shards = list(executor.map(
+                    _simulate_arms, [arm_list[first:last] for first, last in zip(bounds[:-1], bounds[1:])],
+                    [self._engine]*n_shards, [self._cohortID]*n_shards))
+            outcomes = [outcome for shard in shards for outcome in shard]
+        outcomes = dict(zip(arms, outcomes))
+
+        # incremental cost and utility of the therapy with respect to the reference therapy in each scenario
+        increments = []
+        for ref_key, key in keys:
+            increments.append((outcomes[key][0] - outcomes[ref_key][0], outcomes[key][1] - outcomes[ref_key][1]))
+
+        return OneWaySensitivityOutputs(
+            names, [self._bounds[name] for name in names], increments, self._wtp, len(arm_list))
+
+
+def _get_icer(increment):
+    """ :returns the incremental cost-effectiveness ratio (nan if utilities are equal) """
+    d_cost, d_utility = increment
+    return d_cost/d_utility if d_utility != 0 else np.nan
+
+
+class OneWaySensitivityOutputs:
+    def __init__(self, names, bounds, increments, wtp, n_simulated_cohorts):
+        """ outputs of a one-way sensitivity analysis
+        :param names: names of the varied inputs
+        :param bounds: list of (low, high) bounds of the varied inputs
+        :param increments: list of (incremental cost, incremental utility) of the base case followed by
+            the low and high value of each input
+        :param wtp: willingness-to-pay for one additional QALY
+        :param n_simulated_cohorts: number of distinct cohorts simulated
+        """
+        self._wtp = wtp
+        self._nSimulatedCohorts = n_simulated_cohorts
+        self._baseIncrement = increments[0]
+        self._bounds = dict(zip(names, bounds))
+        self._increments = {name: (increments[1 + 2*i], increments[2 + 2*i]) for i, name in enumerate(names)}
+
+        # inputs sorted by the swing in the incremental net monetary benefit (largest first)
+        self._names = sorted(names, key=self.get_nmb_swing, reverse=True)
+
+    def _get_nmb(self, increment):
+        d_cost, d_utility = increment
+        return self._wtp*d_utility - d_cost
+
+    def get_parameters(self):
+        """ :returns names of the varied inputs sorted by their swing in the incremental NMB (largest first) """
+        return self._names
+
+    def get_bounds(self, name):
+        """ :returns the (low, high) bounds of an input """
+        return self._bounds[name]
+
+    def get_base_nmb(self):
+        """ :returns the incremental net monetary benefit of the base case """
+        return self._get_nmb(self._baseIncrement)
+
+    def get_base_icer(self):
+        """ :returns the incremental cost-effectiveness ratio of the base case """
+        return _get_icer(self._baseIncrement)
+
+    def get_nmb_range(self, name):
+        """ :returns the incremental net monetary benefit at the (low, high) bounds of an input """
+        low, high = self._increments[name]
+        return self._get_nmb(low), self._get_nmb(high)
+
+    def get_icer_range(self, name):
+        """ :returns the incremental cost-effectiveness ratio at the (low, high) bounds of an input """
+        low, high = self._increments[name]
+        return _get_icer(low), _get_icer(high)
+
+    def get_nmb_swing(self, name):
+        """ :returns the absolute difference in the incremental NMB between the bounds of an input """
+        low, high = self.get_nmb_range(name)
+        return abs(high - low)
+
+    def get_icer_swing(self, name):
+        """ :returns the absolute difference in the ICER between the bounds of an input """
+        low, high = self.get_icer_range(name)
+        return abs(high - low)
+
+    def get_n_simulated_cohorts(self):
+        """ :returns the number of distinct cohorts simulated """
+        return self._nSimulatedCohorts
+
+    def print_tornado(self):
+        """ prints the incremental NMB and ICER at the bounds of each input, sorted by the swing in NMB """
+
+        print('Base case: incremental NMB = {:,.2f}, ICER = {:,.2f}'.format(self.get_base_nmb(), self.get_base_icer()))
+        for name in self._names:
+            low, high = self.get_bounds(name)
+            nmb_low, nmb_high = self.get_nmb_range(name)
+            icer_low, icer_high = self.get_icer_range(name)
+            print('  {}: [{:.4g}, {:.4g}] -> NMB [{:,.2f}, {:,.2f}], ICER [{:,.2f}, {:,.2f}]'.format(
+                name, low, high, nmb_low, nmb_high, icer_low, icer_high))
@@ -0,0 +1,255 @@
+import numpy as np
+import scipy.stats as stat
+
+# number of consecutive patients whose outcomes are summarized together; the statistics of chunks are merged in
+# order, and chunks follow one grid of patients, so statistics do not depend on how a cohort was simulated
+CHUNK_SIZE = 1000
+
+
+class RunningStat:
+    def __init__(self, name):
+        """ summary statistic updated as observations arrive, keeping only the number of observations, mean,
+        sum of squared deviations from the mean (M2), minimum and maximum; it has the same interface as
+        StatCls.SummaryStat for means and confidence intervals, and statistics of separate groups of
+        observations can be merged exactly
+        :param name: name of this statistic
+        """
+        self.name = name
+        self._n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min = np.inf
+        self._max = -np.inf
+
+    def record(self, obs):
+        """ adds one observation (Welford's update) """
+        self._n += 1
+        delta = obs - self._mean
+        self._mean += delta / self._n
+        self._m2 += delta * (obs - self._mean)
+        self._min = min(self._min, obs)
+        self._max = max(self._max, obs)
+
+    def record_array(self, observations):
+        """ adds an array of observations """
+        observations = np.asarray(observations, dtype=float)
+        if len(observations) == 0:
+            return
+        mean = float(observations.mean())
+        self._add_moments(len(observations), mean, float(np.sum((observations - mean)**2)),
+                          float(observations.min()), float(observations.max()))
+
+    def merge(self, other):
+        """ adds the observations summarized by another statistic """
+        self._add_moments(other.get_n(), other.get_mean(), other.get_m2(), other.get_min(), other.get_max())
+
+    def _add_moments(self, n, mean, m2, minimum, maximum):
+        """ adds a group of observations from its moments (Chan et al. update) """
+        if n == 0:
+            return
+        if self._n == 0:
+            self._n, self._mean, self._m2 = n, mean, m2
+        else:
+            total = self._n + n
+            delta = mean - self._mean
+            self._m2 += m2 + delta**2 * self._n * n / total
+            self._mean += delta * n / total
+            self._n = total
+        self._min = min(self._min, minimum)
+        self._max = max(self._max, maximum)
+
+    def get_n(self):
+        return self._n
+
+    def get_mean(self):
+        return self._mean
+
+    def get_m2(self):
+        """ :returns the sum of squared deviations of observations from their mean """
+        return self._m2
+
+    def get_variance(self):
+        """ :returns the sample variance (nan for fewer than 2 observations) """
+        return self._m2 / (self._n - 1) if self._n > 1 else np.nan
+
+    def get_stdev(self):
+        return np.sqrt(self.get_variance())
+
+    def get_min(self):
+        return self._min
+
+    def get_max(self):
+        return self._max
+
+    def get_t_CI(self, alpha):
+        """ :returns the t-based (1-alpha) confidence interval of the mean """
+        half_width = stat.t.ppf(1 - alpha/2, self._n - 1) * np.sqrt(self.get_variance()/self._n)
+        return [self._mean - half_width, self._mean + half_width]
+
+
+class OutcomeStats:
+    def __init__(self, block_size=1):
+        """ summary statistics of a cohort's outcomes updated as chunks of patients finish, in memory that does
+        not grow with the number of patients; statistics of consecutive groups of patients (e.g. chunks) can be
+        merged exactly as long as each group starts with a new block of dependent patients
+        :param block_size: number of consecutive patients whose outcomes are dependent under the sampling scheme
+            (statistics of strokes, costs and utilities are over the means of blocks, and patients of a block
+            that is not complete are not included)
+        """
+        self._blockSize = block_size
+
+        self._sumStat_survivalTime = RunningStat('Patient survival time')
+        self._sumStat_countStrokes = RunningStat('Time until stroke')
+        self._sumStat_cost = RunningStat('Patient discounted cost')
+        self._sumStat_utility = RunningStat('Patient discounted utility')
+        self._costUtilityC2 = 0.0   # sum of products of deviations of costs and utilities from their means
+
+        # statistics of patients' costs and utilities (without blocks) to measure the variance reduction
+        self._patientCost = RunningStat('Patient discounted cost')
+        self._patientUtility = RunningStat('Patient discounted utility')
+
+        # number of strokes, cost and utility summed over the patients of the block that is not complete
+        self._nInBlock = 0
+        self._blockSums = np.zeros(3)
+
+    def record_arrays(self, survival_times, count_strokes, costs, utilities):
+        """ adds the outcomes of the next patients from arrays (survival times are nan for patients alive) """
+
+        survival_times = np.asarray(survival_times, dtype=float)
+        self._sumStat_survivalTime.record_array(survival_times[~np.isnan(survival_times)])
+        self._patientCost.record_array(costs)
+        self._patientUtility.record_array(utilities)
+        blocks = np.column_stack((count_strokes, costs, utilities)).astype(float)
+
+        # complete the block that is not complete, then add whole blocks, and keep the rest for the next patients
+        first = min((self._blockSize - self._nInBlock) % self._blockSize, len(blocks))
+        if first > 0:
+            self._blockSums += blocks[:first].sum(axis=0)
+            self._nInBlock += first
+            if self._nInBlock == self._blockSize:
+                self._record_block(*(self._blockSums / self._blockSize))
+                self._nInBlock = 0
+                self._blockSums[:] = 0
+        last = first + (len(blocks) - first) // self._blockSize * self._blockSize
+        if last > first:
+            means = blocks[first:last].reshape(-1, self._blockSize, 3).mean(axis=1)
+            stats = [RunningStat(s.name) for s in (self._sumStat_countStrokes, self._sumStat_cost,
+                                                   self._sumStat_utility)]
+            for s, column in zip(stats, means.T):
+                s.record_array(column)
+            c2 = float(np.sum((means[:, 1] - stats[1].get_mean()) * (means[:, 2] - stats[2].get_mean())))
+            self._add_blocks(*stats, c2)
+        if last < len(blocks):
+            self._blockSums += blocks[last:].sum(axis=0)
+            self._nInBlock += len(blocks) - last
+
+    def merge(self, other):
+        """ adds the outcomes of the patients summarized by another OutcomeStats, who follow the patients of
+        this one (the patients of this one must end with a complete block) """
+
+        if self._nInBlock > 0:
+            raise ValueError('Statistics can only be merged after a complete block of dependent patients.')
+        self._sumStat_survivalTime.merge(other._sumStat_survivalTime)
+        self._patientCost.merge(other._patientCost)
+        self._patientUtility.merge(other._patientUtility)
+        self._add_blocks(other._sumStat_countStrokes, other._sumStat_cost, other._sumStat_utility,
+                         other._costUtilityC2)
+        self._nInBlock = other._nInBlock
+        self._blockSums = other._blockSums.copy()
+
+    def _record_block(self, count_strokes, cost, utility):
+        """ adds the mean outcomes of a block (Welford's update of the co-moment of costs and utilities) """
+        delta_cost = cost - self._sumStat_cost.get_mean()
+        self._sumStat_countStrokes.record(count_strokes)
+        self._sumStat_cost.record(cost)
+        self._sumStat_utility.record(utility)
+        self._costUtilityC2 += delta_cost * (utility - self._sumStat_utility.get_mean())
+
+    def _add_blocks(self, count_strokes, costs, utilities, c2):
+        """ adds a group of blocks from the statistics of their mean outcomes and co-moment of costs and utilities
+        (Chan et al. update) """
+        n_a, n_b = self._sumStat_cost.get_n(), costs.get_n()
+        if n_a > 0 and n_b > 0:
+            self._costUtilityC2 += c2 + (costs.get_mean() - self._sumStat_cost.get_mean()) \
+                * (utilities.get_mean() - self._sumStat_utility.get_mean()) * n_a * n_b / (n_a + n_b)
+        else:
+            self._costUtilityC2 += c2
+        self._sumStat_countStrokes.merge(count_strokes)
+        self._sumStat_cost.merge(costs)
+        self._sumStat_utility.merge(utilities)
+
+    def get_block_size(self):
+        return self._blockSize
+
+    def get_n_patients(self):
+        """ :returns the number of patients recorded """
+        return self._patientCost.get_n()
+
+    def get_sumStat_survival_times(self):
+        """ :returns the statistic of the survival times of patients who died """
+        return self._sumStat_survivalTime
+
+    def get_sumStat_count_strokes(self):
+        return self._sumStat_countStrokes
+
+    def get_sumStat_discounted_cost(self):
+        return self._sumStat_cost
+
+    def get_sumStat_discounted_utility(self):
+        return self._sumStat_utility
+
+    def get_cost_utility_covariance(self):
+        """ :returns the sample covariance of discounted costs and utilities (of block means) """
+        n = self._sumStat_cost.get_n()
+        return self._costUtilityC2 / (n - 1) if n > 1 else np.nan
+
+    def get_cost_utility_correlation(self):
+        """ :returns the sample correlation of discounted costs and utilities (of block means) """
+        return self.get_cost_utility_covariance() \
+            / (self._sumStat_cost.get_stdev() * self._sumStat_utility.get_stdev())
+
+    def get_variance_reduction_cost(self):
+        """ :returns the variance of the mean discounted cost with independent patients
+        divided by its variance under the sampling scheme used """
+        return self._get_variance_reduction(self._patientCost, self._sumStat_cost)
+
+    def get_variance_reduction_utility(self):
+        """ :returns the variance of the mean discounted utility with independent patients
+        divided by its variance under the sampling scheme used """
+        return self._get_variance_reduction(self._patientUtility, self._sumStat_utility)
+
+    def _get_variance_reduction(self, patient_stat, block_stat):
+        if self._blockSize == 1:
+            return 1.0
+        var_independent = patient_stat.get_variance() / patient_stat.get_n()
+        var_blocks = block_stat.get_variance() / block_stat.get_n()
+        return var_independent / var_blocks if var_blocks > 0 else np.inf
+
+
+def get_chunk_size(block_size=1):
+    """ :returns the number of patients in a chunk, CHUNK_SIZE rounded down to whole blocks of dependent patients
+    (at least one block) """
+    return max(CHUNK_SIZE // block_size, 1) * block_size
+
+
+def summarize_chunks(survival_times, count_strokes, costs, utilities, block_size=1):
+    """ :returns the statistics (OutcomeStats) of each chunk of patients from arrays of their outcomes
+    (the first patient must be the first of a chunk, so that chunks follow the grid of the cohort)
+    :param block_size: number of consecutive patients whose outcomes are dependent under the sampling scheme
+    """
+    chunk_size = get_chunk_size(block_size)
+    chunk_stats = []
+    for first in range(0, len(survival_times), chunk_size):
+        stats = OutcomeStats(block_size)
+        stats.record_arrays(survival_times[first:first + chunk_size], count_strokes[first:first + chunk_size],
+                            costs[first:first + chunk_size], utilities[first:first + chunk_size])
+        chunk_stats.append(stats)
+    return chunk_stats
+
+
+def merge_chunks(chunk_stats, block_size=1):
+    """ :returns the statistics of consecutive chunks of patients merged in order (OutcomeStats) """
+    stats = OutcomeStats(block_size)
+    for chunk in chunk_stats:
+        stats.merge(chunk)
+    return stats
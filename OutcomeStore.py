@@ -0,0 +1,115 @@
+import os
+import numpy as np
+import OnlineStats
+
+# names of the columns of patients' outcomes (one .npy file each when saved)
+COLUMNS = ['survival_times', 'count_strokes', 'costs', 'utilities']
+DTYPES = [float, np.int64, float, float]
+
+
+class PatientOutcomes:
+    def __init__(self, survival_times, count_strokes, costs, utilities, block_size=1):
+        """ outcomes of simulated patients stored in typed columns (one element per patient), which can be
+        summarized by CohortOutputs and saved to and memory-mapped from .npy files
+        :param survival_times: patients' survival times (nan if alive)
+        :param count_strokes: patients' number of strokes
+        :param costs: patients' discounted costs
+        :param utilities: patients' discounted utilities
+        :param block_size: number of consecutive patients whose outcomes are dependent under the sampling scheme
+        """
+        # np.asarray does not copy arrays (or memory maps) that already have the right type
+        self._survivalTimes = np.asarray(survival_times, dtype=float)
+        self._countStrokes = np.asarray(count_strokes, dtype=np.int64)
+        self._costs = np.asarray(costs, dtype=float)
+        self._utilities = np.asarray(utilities, dtype=float)
+        self._blockSize = block_size
+
+    def get_initial_pop_size(self):
+        return len(self._survivalTimes)
+
+    def get_block_size(self):
+        return self._blockSize
+
+    def get_outcome_columns(self):
+        return self
+
+    def get_horizon_outcomes(self):
+        """ :returns an empty dictionary (outcomes are only available at one time horizon) """
+        return {}
+
+    def get_outcome_stats(self):
+        """ :returns summary statistics of the outcomes (OnlineStats.OutcomeStats), summarized chunk by chunk
+        (so memory-mapped columns are not loaded into memory at once) and merged in order """
+        return OnlineStats.merge_chunks(OnlineStats.summarize_chunks(*self.get_columns(), self._blockSize),
+                                        self._blockSize)
+
+    def get_columns(self):
+        """ :returns the arrays of survival times, number of strokes, discounted costs and utilities """
+        return self._survivalTimes, self._countStrokes, self._costs, self._utilities
+
+    def get_survival_times(self):
+        """ :returns patients' survival times (nan for patients who are still alive) """
+        return self._survivalTimes
+
+    def get_count_strokes(self):
+        return self._countStrokes
+
+    def get_costs(self):
+        return self._costs
+
+    def get_utilities(self):
+        return self._utilities
+
+    def save(self, directory):
+        """ saves each column to a .npy file in a directory
+        :param directory: directory of the files (created if needed)
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name, column in zip(COLUMNS, self.get_columns()):
+            np.save(os.path.join(directory, name + '.npy'), column)
+        np.save(os.path.join(directory, 'block_size.npy'), np.array(self._blockSize))
+
+    @staticmethod
+    def load(directory, mmap=True):
+        """ :returns patients' outcomes saved in a directory
+        :param directory: directory of the files
+        :param mmap: set to False to read the columns into memory instead of memory-mapping them (read-only)
+        """
+        mmap_mode = 'r' if mmap else None
+        columns = [np.load(os.path.join(directory, name + '.npy'), mmap_mode=mmap_mode) for name in COLUMNS]
+        block_size = int(np.load(os.path.join(directory, 'block_size.npy')))
+        return PatientOutcomes(*columns, block_size=block_size)
+
+
+class OutcomeWriter:
+    def __init__(self, directory, n_patients, block_size=1):
+        """ writes patients' outcomes chunk by chunk to memory-mapped .npy files in a directory (the files of
+        PatientOutcomes.save), so that the outcomes of a large cohort are never in memory at once
+        :param directory: directory of the files (created if needed)
+        :param n_patients: number of patients in the cohort
+        :param block_size: number of consecutive patients whose outcomes are dependent under the sampling scheme
+        """
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._blockSize = block_size
+        self._nWritten = 0
+        self._columns = [np.lib.format.open_memmap(os.path.join(directory, name + '.npy'), mode='w+',
+                                                   dtype=dtype, shape=(n_patients,))
+                         for name, dtype in zip(COLUMNS, DTYPES)]
+
+    def write(self, survival_times, count_strokes, costs, utilities):
+        """ writes the outcomes of the next patients from arrays (survival times are nan for patients alive) """
+        n = len(survival_times)
+        for column, values in zip(self._columns, (survival_times, count_strokes, costs, utilities)):
+            column[self._nWritten:self._nWritten + n] = values
+        self._nWritten += n
+
+    def close(self):
+        """ flushes the columns to disk
+        :returns the written outcomes (PatientOutcomes, memory-mapped)
+        """
+        for column in self._columns:
+            column.flush()
+        self._columns = None
+        np.save(os.path.join(self._directory, 'block_size.npy'), np.array(self._blockSize))
+        return PatientOutcomes.load(self._directory)
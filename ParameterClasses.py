@@ -1,7 +1,10 @@
 from enum import Enum
+from collections import OrderedDict
+from bisect import bisect_right
 import numpy as np
 import scipy.stats as stat
 import math as math
+import types
 import InputData as Data
 import scr.MarkovClasses as MarkovCls
 import scr.RandomVariantGenerators as Random
@@ -29,64 +32,180 @@ class Therapies(Enum):
 
 
 
+# names of the annual treatment cost and the transition rate matrix of each therapy in the input data
+THERAPY_INPUTS = {
+    Therapies.ASPIRIN: ('ASPIRIN_COST', 'TRANS_MATRIX_ASPIRIN'),
+    Therapies.DUAL_THERAPY: ('DUAL_COST', 'TRANS_MATRIX_DUAL'),
+    Therapies.WARFARIN: ('WARFARIN_COST', 'TRANS_MATRIX_WARFARIN'),
+    Therapies.DABIGITRAN110: ('DABIGATRAN_COST', 'TRANS_MATRIX_DABIGATRAN110'),
+    Therapies.DABIGITRAN150: ('DABIGATRAN_COST', 'TRANS_MATRIX_DABIGATRAN150'),
+}
+
+
+class TransitionSampler:
+    def __init__(self, cum_probabilities):
+        """ sampler of the next health state, compiled once from a row of the probability matrix
+        :param cum_probabilities: cumulative transition probabilities out of a health state
+        """
+        self._cumProb = list(cum_probabilities)
+
+    def sample(self, rng):
+        """ :returns the index of the next health state (draws the same random number as rndClasses.Empirical) """
+        return bisect_right(self._cumProb, rng.random_sample())
+
+
+def get_cumulative_prob_matrix(prob_matrix):
+    """ :returns the cumulative transition probabilities out of each health state
+    (rows are normalized the same way as in rndClasses.Empirical) """
+
+    prob = np.array(prob_matrix, dtype=float)
+    cum_prob = np.empty_like(prob)
+    for i, row in enumerate(prob):
+        if row.sum() != 1.0:
+            row = row / row.sum()
+        cum_prob[i] = np.cumsum(row)
+        cum_prob[i] /= cum_prob[i, -1]
+    return cum_prob
+
+
+def get_n_time_steps(sim_length, delta_t):
+    """ :returns the number of time steps of length delta_t to cover the simulation length """
+    n_time_steps = 0
+    while n_time_steps*delta_t < sim_length:
+        n_time_steps += 1
+    return n_time_steps
+
 
 class ParametersFixed():
-    def __init__(self, therapy):
+    def __init__(self, therapy, input_data=Data):
+        """ parameters of a therapy (shared by all patients; use get_parameters_fixed to reuse them)
+        :param therapy: selected therapy
+        :param input_data: module (or object) with the model inputs
+        """
 
         # selected therapy
         self._therapy = therapy
 
         # simulation time step
-        self._delta_t = Data.DELTA_T
+        self._delta_t = input_data.DELTA_T
 
         # calculate the adjusted discount rate
-        self._adjDiscountRate = Data.DISCOUNT*Data.DELTA_T
+        self._adjDiscountRate = input_data.DISCOUNT*input_data.DELTA_T
+
+        # number of time steps to cover the simulation length and the discount factor of each time step
+        self._simLength = input_data.SIM_LENGTH
+        self._nTimeSteps = get_n_time_steps(self._simLength, self._delta_t)
+        self._discountFactors = tuple(
+            np.power(1 + self._adjDiscountRate, -np.arange(self._nTimeSteps, dtype=float)).tolist())
+        # sum of the discount factors of time steps 0, ..., k-1 (for k = 0, ..., number of time steps)
+        self._cumDiscountFactors = tuple(np.concatenate(([0.0], np.cumsum(self._discountFactors))).tolist())
 
         # initial health state
         self._initialHealthState = HealthStats.WELL
 
-        # annual treatment cost
-        if self._therapy == Therapies.ASPIRIN:
-            self._annualTreatmentCost = 10.0
-        if self._therapy == Therapies.DABIGITRAN110:
-            self._annualTreatmentCost = 3240
-        if self._therapy == Therapies.DABIGITRAN150:
-            self._annualTreatmentCost = 3240
-        else:
-            self._annualTreatmentCost = Data.WARFARIN_COST
-
-        # transition rate matrix of the selected therapy
-        self._rate_matrix = []
-        self._prob_matrix = []
+        # annual treatment cost and transition rate matrix of the selected therapy
+        cost_name, matrix_name = THERAPY_INPUTS[self._therapy]
+        self._annualTreatmentCost = getattr(input_data, cost_name)
+        self._rate_matrix = getattr(input_data, matrix_name)
+
         # treatment relative risk
         self._treatmentRR = 0
 
-        # calculate transition probabilities depending of which therapy options is in use
-        if therapy == Therapies.ASPIRIN:
-            self._rate_matrix = Data.TRANS_MATRIX_ASPIRIN
-            # convert rate to probability
-            self._prob_matrix[:], p = MarkovCls.continuous_to_discrete(self._rate_matrix, Data.DELTA_T)
-           # print('Upper bound on the probability of two transitions within delta_t:', p)
-        # calculate transition probabilities depending of which therapy options is in use
-        if therapy == Therapies.DABIGITRAN110:
-            self._rate_matrix = Data.TRANS_MATRIX_DABIGATRAN110
-            # convert rate to probability
-            self._prob_matrix[:], p = MarkovCls.continuous_to_discrete(self._rate_matrix, Data.DELTA_T)
-           # print('Upper bound on the probability of two transitions within delta_t:', p)
-        # calculate transition probabilities depending of which therapy options is in use
-        if therapy == Therapies.DABIGITRAN150:
-            self._rate_matrix = Data.TRANS_MATRIX_DABIGATRAN150
-            # convert rate to probability
-            self._prob_matrix[:], p = MarkovCls.continuous_to_discrete(self._rate_matrix, Data.DELTA_T)
-           # print('Upper bound on the probability of two transitions within delta_t:', p)
-        else:
-            self._rate_matrix = Data.TRANS_MATRIX_WARFARIN
-            self._prob_matrix[:], p = MarkovCls.continuous_to_discrete(self._rate_matrix, Data.DELTA_T)
-           # print('Upper bound on the probability of two transitions within delta_t:', p)
+        # convert rate to probability
+        self._prob_matrix, p = MarkovCls.continuous_to_discrete(self._rate_matrix, input_data.DELTA_T)
+        # print('Upper bound on the probability of two transitions within delta_t:', p)
+
+        # the probability matrix is shared between patients and should not change
+        self._prob_matrix = tuple(tuple(row) for row in self._prob_matrix)
+
+        # cumulative transition probabilities and one sampler per health state
+        self._cumProbMatrix = get_cumulative_prob_matrix(self._prob_matrix)
+        self._cumProbMatrix.setflags(write=False)
+        self._transitionSamplers = [TransitionSampler(row) for row in self._cumProbMatrix]
+
+        # probability of staying in each state for one more time step, and
+        # samplers of the next state given that the patient leaves its current state
+        self._selfLoopProbs, self._leaveSamplers = self._build_leave_samplers()
 
         # annual state costs and utilities
-        self._annualStateCosts = Data.ANNUAL_STATE_COST
-        self._annualStateUtilities = Data.ANNUAL_STATE_UTILITY
+        self._annualStateCosts = tuple(input_data.ANNUAL_STATE_COST)
+        self._annualStateUtilities = tuple(input_data.ANNUAL_STATE_UTILITY)
+
+        # one-off cost of dying in each state (continuous-time engine)
+        self._deathCostYears = input_data.DEATH_COST_YEARS
+
+        # cost and utility of a time step for each transition (current state, next state)
+        self._transitionCosts, self._transitionUtilities = self._build_transition_rewards()
+
+        # continuous-time parameters: rate of leaving each state, sampler of the next state at a jump,
+        # and the continuously compounded discount rate
+        self._exitRates, self._jumpSamplers = self._build_jump_process()
+        self._continuousDiscountRate = math.log(1 + input_data.DISCOUNT)
+
+    def _build_transition_rewards(self):
+        """ :returns matrices of the (undiscounted) cost and utility of a time step
+        for each pair of (current state, next state) """
+
+        costs = []
+        utilities = []
+        for current_state in HealthStats:
+            cost_row = []
+            utility_row = []
+            for next_state in HealthStats:
+                cost = 0.5*(self.get_annual_state_cost(current_state) +
+                            self.get_annual_state_cost(next_state)) * self._delta_t
+                utility = 0.5*(self.get_annual_state_utility(current_state) +
+                               self.get_annual_state_utility(next_state)) * self._delta_t
+
+                # treatment cost (incurred only in post-stroke state, for the full time step)
+                if current_state is HealthStats.POST_STROKE:
+                    cost += 1 * self._annualTreatmentCost * self._delta_t
+
+                cost_row.append(cost)
+                utility_row.append(utility)
+            costs.append(tuple(cost_row))
+            utilities.append(tuple(utility_row))
+
+        return tuple(costs), tuple(utilities)
+
+    def _build_leave_samplers(self):
+        """ :returns the probability of staying in each health state for one time step and, for each health state,
+        a sampler of the next state given that the patient leaves """
+
+        prob = np.diff(self._cumProbMatrix, axis=1, prepend=0)
+        self_loop_probs = np.diag(prob).copy()
+
+        samplers = []
+        for state, self_loop_prob in enumerate(self_loop_probs):
+            leave_prob = prob[state].copy()
+            leave_prob[state] = 0
+            if leave_prob.sum() > 0:
+                samplers.append(TransitionSampler(np.cumsum(leave_prob) / np.sum(leave_prob)))
+            else:
+                # absorbing state (never used for sampling)
+                samplers.append(None)
+
+        return tuple(self_loop_probs.tolist()), samplers
+
+    def _build_jump_process(self):
+        """ :returns the total rate of leaving each health state and, for each health state,
+        a sampler of the next state given that the patient leaves """
+
+        rates = np.array([[0.0 if rate is None else rate for rate in row] for row in self._rate_matrix])
+        np.fill_diagonal(rates, 0)
+        exit_rates = rates.sum(axis=1)
+
+        samplers = []
+        for state, exit_rate in enumerate(exit_rates):
+            if exit_rate > 0:
+                jump_prob = rates[state] / exit_rate
+            else:
+                # absorbing state (never used for sampling)
+                jump_prob = np.zeros(len(exit_rates))
+                jump_prob[state] = 1
+            samplers.append(TransitionSampler(np.cumsum(jump_prob) / np.sum(jump_prob)))
+
+        return tuple(exit_rates.tolist()), samplers
 
     def get_initial_health_state(self):
         return self._initialHealthState
@@ -97,9 +216,52 @@ class ParametersFixed():
     def get_adj_discount_rate(self):
         return self._adjDiscountRate
 
+    def get_sim_length(self):
+        return self._simLength
+
+    def get_n_time_steps(self):
+        return self._nTimeSteps
+
+    def get_discount_factors(self):
+        """ :returns the discount factor of each time step (1/(1+r)^k for the adjusted discount rate r) """
+        return self._discountFactors
+
+    def get_cumulative_discount_factors(self):
+        """ :returns the sum of the discount factors of time steps 0, ..., k-1 for k = 0, ..., number of time steps """
+        return self._cumDiscountFactors
+
     def get_transition_prob(self, state):
         return self._prob_matrix[state.value]
 
+    def get_transition_prob_matrix(self):
+        return self._prob_matrix
+
+    def get_transition_sampler(self, state):
+        return self._transitionSamplers[state.value]
+
+    def get_cumulative_prob_matrix(self):
+        return self._cumProbMatrix
+
+    def get_self_loop_prob(self, state):
+        """ :returns the probability of staying in a health state for one time step """
+        return self._selfLoopProbs[state.value]
+
+    def get_leave_sampler(self, state):
+        """ :returns the sampler of the next health state given that the patient leaves a health state """
+        return self._leaveSamplers[state.value]
+
+    def get_exit_rate(self, state):
+        """ :returns the annual rate of leaving a health state (0 for absorbing states) """
+        return self._exitRates[state.value]
+
+    def get_jump_sampler(self, state):
+        """ :returns the sampler of the next health state when the patient leaves a health state """
+        return self._jumpSamplers[state.value]
+
+    def get_continuous_discount_rate(self):
+        """ :returns the continuously compounded annual discount rate, ln(1 + DISCOUNT) """
+        return self._continuousDiscountRate
+
     def get_annual_state_cost(self,state):
             return self._annualStateCosts[state.value]
 
@@ -108,3 +270,131 @@ class ParametersFixed():
 
     def get_annual_treatment_cost(self):
         return self._annualTreatmentCost
+
+    def get_death_cost(self, state):
+        """ :returns the one-off cost of dying into a death state (charged at the time of death in continuous time) """
+        return self._deathCostYears * self._annualStateCosts[state.value]
+
+    def get_transition_cost_matrix(self):
+        """ :returns cost of a time step for each transition (indexed by [current state][next state]) """
+        return self._transitionCosts
+
+    def get_transition_utility_matrix(self):
+        """ :returns utility of a time step for each transition (indexed by [current state][next state]) """
+        return self._transitionUtilities
+
+
+def get_parameters_key(therapy, input_data=Data):
+    """ :returns a hashable key of the model inputs that the parameters of a therapy are built from
+    (input data that differ only in inputs this therapy does not use give the same key)
+    :param therapy: selected therapy
+    :param input_data: module (or object) with the model inputs
+    """
+
+    cost_name, matrix_name = THERAPY_INPUTS[therapy]
+    return (therapy, input_data.DELTA_T, input_data.DISCOUNT, input_data.SIM_LENGTH,
+            tuple(input_data.ANNUAL_STATE_COST), tuple(input_data.ANNUAL_STATE_UTILITY), input_data.DEATH_COST_YEARS,
+            getattr(input_data, cost_name), tuple(tuple(row) for row in getattr(input_data, matrix_name)))
+
+
+# parameters already built, keyed by get_parameters_key, from the least to the most recently used (sweeps over
+# continuous inputs, e.g. threshold or one-way analyses, build new parameters at every value, so only the most
+# recently used ones are kept)
+PARAMETERS_CACHE_SIZE = 64
+_parametersCache = OrderedDict()
+
+
+def get_parameters_fixed(therapy, input_data=Data):
+    """ :returns the parameters of a therapy, building them only the first time they are requested
+    for these values of the inputs of the therapy (the returned object is shared and should not be modified)
+    :param therapy: selected therapy
+    :param input_data: module (or object) with the model inputs
+    """
+
+    key = get_parameters_key(therapy, input_data)
+    if key in _parametersCache:
+        _parametersCache.move_to_end(key)
+    else:
+        _parametersCache[key] = ParametersFixed(therapy, input_data)
+        if len(_parametersCache) > PARAMETERS_CACHE_SIZE:
+            _parametersCache.popitem(last=False)
+    return _parametersCache[key]
+
+
+def build_input_data(input_data=Data, **values):
+    """ :returns a copy of the model inputs with some of their values replaced
+    (transition rate matrices are recalculated from the new rates and probabilities)
+    :param input_data: module (or object) with the model inputs
+    :param values: new values of inputs, e.g. d=0.089 or DABIGATRAN_COST=1800 (transition rate matrices
+        cannot be replaced since they are calculated from the rates and probabilities)
+    """
+
+    inputs = types.SimpleNamespace(**{name: value for name, value in vars(input_data).items()
+                                      if not name.startswith('__') and not isinstance(value, types.ModuleType)})
+    for name, value in values.items():
+        if not hasattr(inputs, name):
+            raise ValueError('{} is not a model input.'.format(name))
+        if name.startswith('TRANS_MATRIX_'):
+            raise ValueError('{} is calculated from the rates and probabilities; '
+                             'replace those instead.'.format(name))
+        setattr(inputs, name, value)
+
+    inputs.TRANS_MATRIX_ASPIRIN, inputs.TRANS_MATRIX_DUAL, inputs.TRANS_MATRIX_WARFARIN, \
+        inputs.TRANS_MATRIX_DABIGATRAN110, inputs.TRANS_MATRIX_DABIGATRAN150 = inputs.get_trans_rate_matrices(inputs)
+    return inputs
+
+
+# annual rates, stroke-severity splits and drug costs that vary in probabilistic sensitivity analysis
+RATE_INPUTS = ['a', 'b', 'c', 'd', 'e', 's', 'f', 'g', 'recur_stroke_rate']
+SEVERITY_SPLIT_INPUTS = [['h', 'i', 'j', 'k'], ['l', 'm', 'n', 'o']]
+DRUG_COST_INPUTS = ['ASPIRIN_COST', 'DUAL_COST', 'WARFARIN_COST', 'DABIGATRAN_COST']
+
+
+def sample_input_values(rng, input_data=Data):
+    """ :returns a dictionary of model inputs drawn from the distributions declared in the input data
+    (gamma for rates and costs, beta for utilities and the probability of TIA, Dirichlet for stroke severity)
+    :param rng: random number generator
+    :param input_data: module (or object) with the model inputs
+    """
+
+    def gamma(mean, cv):
+        return rng.gamma(shape=1/cv**2, scale=mean*cv**2) if mean > 0 else mean
+
+    def beta(mean, n):
+        return rng.beta(mean*n, (1-mean)*n) if 0 < mean < 1 else mean
+
+    values = {}
+    for name in RATE_INPUTS:
+        values[name] = gamma(getattr(input_data, name), input_data.RATE_CV)
+
+    n = input_data.STROKE_SAMPLE_SIZE
+    values['p'] = beta(input_data.p, n)
+    for names in SEVERITY_SPLIT_INPUTS:
+        split = np.array([getattr(input_data, name) for name in names])
+        sampled = rng.dirichlet(n * split / split.sum()) * split.sum()
+        values.update(zip(names, sampled.tolist()))
+
+    values['ANNUAL_STATE_COST'] = [gamma(cost, input_data.COST_CV) for cost in input_data.ANNUAL_STATE_COST]
+    for name in DRUG_COST_INPUTS:
+        values[name] = gamma(getattr(input_data, name), input_data.COST_CV)
+
+    # beta distribution with the declared standard deviation
+    values['ANNUAL_STATE_UTILITY'] = [
+        beta(u, u*(1-u)/input_data.UTILITY_SD**2 - 1) for u in input_data.ANNUAL_STATE_UTILITY]
+
+    return values
+
+
+class ParametersProbabilistic(ParametersFixed):
+    def __init__(self, therapy, seed, input_data=Data):
+        """ parameters of a therapy with model inputs drawn from the distributions declared in the input data
+        :param therapy: selected therapy
+        :param seed: seed of the random number generator (the same seed draws the same inputs for every therapy)
+        :param input_data: module (or object) with the model inputs
+        """
+        self._sampledValues = sample_input_values(Random.RNG(seed), input_data)
+        ParametersFixed.__init__(self, therapy, build_input_data(input_data, **self._sampledValues))
+
+    def get_sampled_values(self):
+        """ :returns the dictionary of sampled model inputs """
+        return self._sampledValues
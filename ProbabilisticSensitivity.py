@@ -0,0 +1,123 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+import numpy as np
+import ParameterClasses as P
+import MarkovModel as MarkovCls
+import InputData as Data
+
+
+def _get_scalar_values(values):
+    """ :returns sampled model inputs as a dictionary of scalars
+    (lists such as ANNUAL_STATE_COST are split into ANNUAL_STATE_COST[0], ANNUAL_STATE_COST[1], ...) """
+
+    scalars = {}
+    for name, value in values.items():
+        if isinstance(value, list):
+            for i, v in enumerate(value):
+                scalars['{}[{}]'.format(name, i)] = v
+        else:
+            scalars[name] = value
+    return scalars
+
+
+def _simulate_draws(psa_id, n_draws, therapies, first, last, input_data=Data):
+    """ evaluate parameter draws first, ..., last-1 of a probabilistic sensitivity analysis
+    (used by processes of a pool)
+    :returns arrays of expected discounted costs and utilities (draws x therapies) and a list of
+        the sampled model inputs of each draw
+    """
+
+    costs = np.empty((last - first, len(therapies)))
+    utilities = np.empty((last - first, len(therapies)))
+    values = []
+    for row, draw in enumerate(range(first, last)):
+        for col, therapy in enumerate(therapies):
+            # every therapy uses the same seed, and so the same model inputs, in a draw
+            param = P.ParametersProbabilistic(therapy, psa_id * n_draws + draw, input_data)
+            outputs = MarkovCls.CohortTrace(therapy, param).simulate()
+            costs[row, col] = outputs.get_sumStat_discounted_cost().get_mean()
+            utilities[row, col] = outputs.get_sumStat_discounted_utility().get_mean()
+        values.append(_get_scalar_values(param.get_sampled_values()))
+
+    return costs, utilities, values
+
+
+class PSA:
+    def __init__(self, id, n_draws, therapies=None, input_data=Data):
+        """ probabilistic sensitivity analysis: each draw samples the model inputs from the distributions
+        declared in the input data and calculates the expected outcomes of every therapy with the cohort trace
+        :param id: an integer to specify the seed of random number generators (draw i uses id * n_draws + i)
+        :param n_draws: number of parameter draws
+        :param therapies: list of therapies (all therapies if None)
+        :param input_data: module (or object) with the model inputs
+        """
+        self._id = id
+        self._nDraws = n_draws
+        self._therapies = list(P.Therapies) if therapies is None else therapies
+        self._inputData = input_data
+
+    def simulate(self, n_workers=1):
+        """ evaluate all parameter draws
+        :param n_workers: number of processes to shard draws across (None to use all cores)
+        :returns outputs of this probabilistic sensitivity analysis
+        """
+
+        if n_workers == 1:
+            shards = [_simulate_draws(self._id, self._nDraws, self._therapies, 0, self._nDraws, self._inputData)]
+        else:
+            if n_workers is None:
+                n_workers = os.cpu_count()
+            # modules cannot be sent to other processes, so send a copy of the model inputs
+            input_data = P.build_input_data(self._inputData)
+            n_shards = min(self._nDraws, 4*n_workers)
+            bounds = np.linspace(0, self._nDraws, n_shards + 1).astype(int).tolist()
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                shards = list(executor.map(
+                    _simulate_draws,
+                    [self._id]*n_shards, [self._nDraws]*n_shards, [self._therapies]*n_shards,
+                    bounds[:-1], bounds[1:], [input_data]*n_shards))
+
+        costs = np.concatenate([shard[0] for shard in shards])
+        utilities = np.concatenate([shard[1] for shard in shards])
+        values = [draw_values for shard in shards for draw_values in shard[2]]
+        return PSAOutputs(self._therapies, costs, utilities, values)
+
+
+class PSAOutputs:
+    def __init__(self, therapies, costs, utilities, values):
+        """ outputs of a probabilistic sensitivity analysis
+        :param therapies: list of therapies
+        :param costs: expected discounted costs (draws x therapies)
+        :param utilities: expected discounted utilities (draws x therapies)
+        :param values: list of dictionaries of the sampled model inputs of each draw
+        """
+        self._therapies = therapies
+        self._costs = costs
+        self._utilities = utilities
+        self._parameterValues = {name: np.array([draw[name] for draw in values]) for name in values[0]}
+
+    def get_therapies(self):
+        return self._therapies
+
+    def get_n_draws(self):
+        return len(self._costs)
+
+    def get_costs(self, therapy):
+        """ :returns the expected discounted cost of a therapy in each draw """
+        return self._costs[:, self._therapies.index(therapy)]
+
+    def get_utilities(self, therapy):
+        """ :returns the expected discounted utility of a therapy in each draw """
+        return self._utilities[:, self._therapies.index(therapy)]
+
+    def get_cost_matrix(self):
+        """ :returns expected discounted costs (draws x therapies) """
+        return self._costs
+
+    def get_utility_matrix(self):
+        """ :returns expected discounted utilities (draws x therapies) """
+        return self._utilities
+
+    def get_parameter_values(self):
+        """ :returns a dictionary of the sampled value of each model input in each draw """
+        return self._parameterValues
@@ -0,0 +1,91 @@
+import numpy as np
+import scipy.stats as stat
+
+
+class DiscountedStat:
+    def __init__(self, name, n, mean, variance):
+        """ summary statistic of patients' discounted totals calculated from their moments, with the same
+        interface as StatCls.SummaryStat for means and confidence intervals
+        :param name: name of this outcome
+        :param n: number of (independent) observations
+        :param mean: sample mean
+        :param variance: sample variance
+        """
+        self.name = name
+        self._n = n
+        self._mean = mean
+        self._variance = variance
+
+    def get_mean(self):
+        return self._mean
+
+    def get_stdev(self):
+        return np.sqrt(self._variance)
+
+    def get_t_CI(self, alpha):
+        """ :returns the t-based (1-alpha) confidence interval of the mean """
+        half_width = stat.t.ppf(1 - alpha/2, self._n - 1) * np.sqrt(self._variance/self._n)
+        return [self._mean - half_width, self._mean + half_width]
+
+
+class CycleOutcomes:
+    def __init__(self, delta_t, n_cycles):
+        """ undiscounted cost and utility of each patient in each time step (cycle), aggregated over patients as
+        the mean and the matrix of sums of squared deviations across cycles, so that patients' discounted totals
+        can be summarized under any discount rate without simulating again
+        :param delta_t: simulation time step
+        :param n_cycles: number of time steps in the simulation
+        """
+        self._delta_t = delta_t
+        self._n = 0
+        self._costMean = np.zeros(n_cycles)
+        self._utilityMean = np.zeros(n_cycles)
+        self._costM2 = np.zeros((n_cycles, n_cycles))
+        self._utilityM2 = np.zeros((n_cycles, n_cycles))
+
+    def add(self, costs, utilities):
+        """ adds the observations of a group of patients (Chan et al. update of the mean and sums of squares)
+        :param costs: undiscounted cost of each patient (row) in each time step (column)
+        :param utilities: undiscounted utility of each patient (row) in each time step (column)
+        """
+
+        n = len(costs)
+        if n == 0:
+            return
+        total = self._n + n
+        for mean, m2, observations in ((self._costMean, self._costM2, costs),
+                                       (self._utilityMean, self._utilityM2, utilities)):
+            group_mean = observations.mean(axis=0)
+            deviations = observations - group_mean
+            delta = group_mean - mean
+            m2 += deviations.T @ deviations + np.outer(delta, delta) * self._n * n / total
+            mean += delta * n / total
+        self._n = total
+
+    def get_n(self):
+        return self._n
+
+    def get_discount_factors(self, discount):
+        """ :returns the discount factor of each time step for an annual discount rate
+        (calculated with the adjusted discount rate discount * delta_t, as in ParameterClasses.ParametersFixed) """
+        return np.power(1 + discount*self._delta_t, -np.arange(len(self._costMean), dtype=float))
+
+    def get_mean_cost_per_cycle(self):
+        """ :returns the mean undiscounted cost of each time step """
+        return self._costMean
+
+    def get_mean_utility_per_cycle(self):
+        """ :returns the mean undiscounted utility of each time step """
+        return self._utilityMean
+
+    def get_sumStat_discounted_cost(self, discount):
+        """ :returns the summary statistic of patients' discounted costs under an annual discount rate """
+        factors = self.get_discount_factors(discount)
+        return DiscountedStat('Patient discounted cost', self._n, self._costMean @ factors,
+                              factors @ self._costM2 @ factors / (self._n - 1))
+
+    def get_sumStat_discounted_utility(self, discount):
+        """ :returns the summary statistic of patients' discounted utilities under an annual discount rate """
+        factors = self.get_discount_factors(discount)
+        return DiscountedStat('Patient discounted utility', self._n, self._utilityMean @ factors,
+                              factors @ self._utilityM2 @ factors / (self._n - 1))
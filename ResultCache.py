@@ -0,0 +1,123 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import numpy as np
+import scipy
+import scr.MarkovClasses as MarkovCls
+import scr.RandomVariantGenerators as Random
+import ParameterClasses as P
+import OutcomeStore
+import InputData as Data
+
+# source files whose changes invalidate cached results
+CODE_FILES = ['MarkovModel.py', 'ParameterClasses.py', 'OutcomeStore.py', 'ResultCache.py']
+# modules of the support library whose source changes invalidate cached results (random number generators and
+# the conversion of rate matrices), and libraries whose version does (numpy draws, scipy's Sobol sequences)
+LIBRARY_MODULES = [Random, MarkovCls]
+LIBRARY_VERSIONS = [np, scipy]
+
+_codeVersion = None
+
+
+def get_code_version():
+    """ :returns a hash of the source of the model and the support library, and of the versions of the
+    numerical libraries (calculated once per process) """
+
+    global _codeVersion
+    if _codeVersion is None:
+        digest = hashlib.sha256()
+        paths = [os.path.join(os.path.dirname(os.path.abspath(__file__)), file_name) for file_name in CODE_FILES] \
+            + [module.__file__ for module in LIBRARY_MODULES]
+        for path in paths:
+            with open(path, 'rb') as file:
+                digest.update(file.read())
+        for library in LIBRARY_VERSIONS:
+            digest.update('{} {}'.format(library.__name__, library.__version__).encode())
+        _codeVersion = digest.hexdigest()
+    return _codeVersion
+
+
+def get_cohort_key(cohort_id, therapy, engine, sampling, input_data):
+    """ :returns the hash that identifies the outcomes of a cohort: the inputs its therapy is built from,
+    the cohort id, population size, simulation length, time step, engine, sampling scheme and code version
+    :param cohort_id: id of the cohort
+    :param therapy: selected therapy
+    :param engine: simulation engine
+    :param sampling: scheme to generate patients' random numbers
+    :param input_data: module (or object) with the model inputs
+    """
+
+    key = (P.get_parameters_key(therapy, input_data), cohort_id, input_data.POP_SIZE, input_data.SIM_LENGTH,
+           input_data.DELTA_T, engine, sampling, get_code_version())
+    return hashlib.sha256(repr(key).encode()).hexdigest()
+
+
+def load_outcomes(cache_dir, key):
+    """ :returns the outcomes of a cohort stored under a key (OutcomeStore.PatientOutcomes, memory-mapped),
+    or None if they are not in the cache
+    :param cache_dir: directory of the cache
+    :param key: hash of the cohort (see get_cohort_key)
+    """
+
+    try:
+        return OutcomeStore.PatientOutcomes.load(os.path.join(cache_dir, key))
+    except (OSError, ValueError):
+        # not cached, or a damaged entry that will be overwritten
+        return None
+
+
+def save_outcomes(cache_dir, key, outcomes):
+    """ stores the outcomes of a cohort under a key
+    :param cache_dir: directory of the cache
+    :param key: hash of the cohort (see get_cohort_key)
+    :param outcomes: outcomes of patients (OutcomeStore.PatientOutcomes)
+    """
+
+    temp_dir = create_entry(cache_dir)
+    outcomes.save(temp_dir)
+    store_entry(cache_dir, key, temp_dir)
+
+
+def create_entry(cache_dir):
+    """ :returns a new temporary directory in the cache to write the outcomes of a cohort to (see store_entry)
+    :param cache_dir: directory of the cache
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    return tempfile.mkdtemp(dir=cache_dir)
+
+
+def store_entry(cache_dir, key, temp_dir):
+    """ moves outcomes written to a temporary directory of the cache under a key (the columns are complete
+    before they are moved, so concurrent runs never read a partly written result)
+    :param cache_dir: directory of the cache
+    :param key: hash of the cohort (see get_cohort_key)
+    :param temp_dir: directory returned by create_entry
+    """
+
+    target = os.path.join(cache_dir, key)
+    shutil.rmtree(target, ignore_errors=True)
+    try:
+        os.rename(temp_dir, target)
+    except OSError:
+        # another run stored the same outcomes in the meantime
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def get_cache_size(cache_dir=Data.CACHE_DIR):
+    """ :returns the number of bytes used by the cache
+    :param cache_dir: directory of the cache (None when the cache is turned off)
+    """
+    if cache_dir is None:
+        return 0
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, dirs, files in os.walk(cache_dir) for name in files)
+
+
+def clear_cache(cache_dir=Data.CACHE_DIR):
+    """ deletes all cached outcomes (cohorts are simulated again the next time they are needed)
+    :param cache_dir: directory of the cache (None when the cache is turned off)
+    """
+    if cache_dir is None:
+        return
+    shutil.rmtree(cache_dir, ignore_errors=True)
@@ -12,7 +12,7 @@ simOutputs = cohort.simulate()
 
 # graph survival curve
 PathCls.graph_sample_path(
-    sample_path=simOutputs.get_survival_curve(),
+    sample_path=simOutputs.get_survival_curve().to_sample_path(),
     title='Survival curve',
     x_label='Simulation time step',
     y_label='Number of alive patients'
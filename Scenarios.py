@@ -0,0 +1,92 @@
+import ParameterClasses as P
+import MarkovModel as MarkovCls
+import InputData as Data
+
+
+class Scenario:
+    def __init__(self, name, **values):
+        """ a scenario of the model, declared as new values of some inputs on top of the base inputs
+        :param name: name of this scenario
+        :param values: new values of inputs, e.g. d=0.089 or DABIGATRAN_COST=1800.0
+        """
+        self._name = name
+        self._values = values
+
+    def get_name(self):
+        return self._name
+
+    def get_values(self):
+        """ :returns the dictionary of inputs that this scenario changes """
+        return self._values
+
+    def get_input_data(self, base=Data):
+        """ :returns a copy of the base inputs with the values of this scenario
+        :param base: module (or object) with the base model inputs
+        """
+        return P.build_input_data(base, **self._values)
+
+
+# base case
+BASE_CASE = Scenario('Base case')
+
+# sensitivity analysis 1: baseline stroke rates based on a CHADS score of 4
+INCREASED_STROKE_RATE = Scenario('Increased baseline stroke rate', d=0.089, s=0.03916, f=0.09879, g=0.06764)
+
+# sensitivity analysis 2: cost of dabigatran given in the sensitivity analysis of costs in the paper
+DABIGATRAN_COST_1800 = Scenario('Dabigatran cost of $1800', DABIGATRAN_COST=1800.0)
+
+SCENARIOS = [BASE_CASE, INCREASED_STROKE_RATE, DABIGATRAN_COST_1800]
+
+
+class ScenarioRunner:
+    def __init__(self, engine=MarkovCls.Engine.PATIENT, sampling=MarkovCls.Sampling.PSEUDO_RANDOM,
+                 n_workers=1, base=Data):
+        """ simulates cohorts under many scenarios in one process; a cohort is simulated only once for all
+        scenarios that give the same inputs to its therapy (e.g. the warfarin cohort is shared by scenarios
+        that only change the cost of dabigatran), and parameters are shared through P.get_parameters_fixed
+        :param engine: simulation engine of cohorts
+        :param sampling: scheme to generate patients' random numbers
+        :param n_workers: number of processes to simulate each cohort (None to use all cores)
+        :param base: module (or object) with the base model inputs
+        """
+        self._engine = engine
+        self._sampling = sampling
+        self._nWorkers = n_workers
+        self._base = base
+        self._inputData = {}    # input data of each scenario
+        self._outputs = {}      # outputs of simulated cohorts, keyed by (inputs of the therapy, pop size, id)
+
+    def get_input_data(self, scenario):
+        """ :returns the model inputs of a scenario (built once per scenario) """
+        if scenario not in self._inputData:
+            self._inputData[scenario] = scenario.get_input_data(self._base)
+        return self._inputData[scenario]
+
+    def simulate(self, scenario, therapy, cohort_id):
+        """ :returns outputs of the cohort of a therapy under a scenario, simulating it only if no cohort
+        with the same id has been simulated with the same inputs of this therapy
+        :param scenario: a Scenario
+        :param therapy: selected therapy
+        :param cohort_id: id of the cohort (use the same id for all therapies to compare them
+            with common random numbers)
+        """
+
+        input_data = self.get_input_data(scenario)
+        key = (P.get_parameters_key(therapy, input_data), input_data.POP_SIZE, cohort_id)
+        if key not in self._outputs:
+            cohort = MarkovCls.Cohort(cohort_id, therapy, self._engine, self._sampling, input_data)
+            self._outputs[key] = cohort.simulate(self._nWorkers)
+        return self._outputs[key]
+
+    def simulate_comparison(self, scenario, therapies, cohort_id):
+        """ :returns list of outputs of the cohorts of therapies under a scenario, simulated with
+        common random numbers
+        :param scenario: a Scenario
+        :param therapies: list of therapies
+        :param cohort_id: id of the cohorts
+        """
+        return [self.simulate(scenario, therapy, cohort_id) for therapy in therapies]
+
+    def get_n_simulated_cohorts(self):
+        """ :returns the number of cohorts actually simulated """
+        return len(self._outputs)
@@ -55,8 +55,8 @@ def draw_survival_curves_and_histograms(simOutputs_warfarin, simOutputs_Dabigitr
     # get survival curves of both treatments
     survival_curves = [
 
-        simOutputs_warfarin.get_survival_curve(),
-        simOutputs_Dabigitran150.get_survival_curve()
+        simOutputs_warfarin.get_survival_curve().to_sample_path(),
+        simOutputs_Dabigitran150.get_survival_curve().to_sample_path()
     ]
 
     # graph survival curve
@@ -86,14 +86,24 @@ def draw_survival_curves_and_histograms(simOutputs_warfarin, simOutputs_Dabigitr
     )
 
 
-def print_comparative_outcomes(simOutputs_warfarin, simOutputs_Dabigitran150):
+def get_difference_stat(if_paired, name, x, y_ref):
+    """ :returns the paired difference statistic if the observations are paired
+    (cohorts simulated with common random numbers), and the independent one otherwise """
+    if if_paired:
+        return Stat.DifferenceStatPaired(name=name, x=x, y_ref=y_ref)
+    return Stat.DifferenceStatIndp(name=name, x=x, y_ref=y_ref)
+
+
+def print_comparative_outcomes(simOutputs_warfarin, simOutputs_Dabigitran150, if_paired=False):
     """ prints average increase in survival time, discounted cost, and discounted utility
     under dab therapy compared to warf therapy
     :param simOutputs_warfarin: output of a cohort simulated under warfarin therapy
     :param simOutputs_Dabigitran150: output of a cohort simulated under dab therapy
+    :param if_paired: set to True if the cohorts used common random numbers (same cohort id)
     """
 
     # increase in survival time under dab therapy with respect to warf therapy
+    # (only patients who died have a survival time, so survival times cannot be paired)
     increase_survival_time = Stat.DifferenceStatIndp(name="Increase in survival time",
                                                      x=simOutputs_Dabigitran150.get_survival_times(),
                                                      y_ref=simOutputs_warfarin.get_survival_times())
@@ -107,7 +117,8 @@ def print_comparative_outcomes(simOutputs_warfarin, simOutputs_Dabigitran150):
           estimate_CI)
 
     # increase in discounted total cost under dab therapy with respect to warfarin therapy
-    increase_discounted_cost = Stat.DifferenceStatIndp(
+    increase_discounted_cost = get_difference_stat(
+        if_paired=if_paired,
         name='Increase in discounted cost',
         x=simOutputs_Dabigitran150.get_costs(),
         y_ref=simOutputs_warfarin.get_costs())
@@ -123,7 +134,8 @@ def print_comparative_outcomes(simOutputs_warfarin, simOutputs_Dabigitran150):
           estimate_CI)
 
     # increase in discounted total utility under dab therapy with respect to warfarin therapy
-    increase_discounted_utility = Stat.DifferenceStatIndp(
+    increase_discounted_utility = get_difference_stat(
+        if_paired=if_paired,
         name='Increase in discounted cost',
         x=simOutputs_Dabigitran150.get_utilities(),
         y_ref=simOutputs_warfarin.get_utilities())
@@ -138,7 +150,10 @@ def print_comparative_outcomes(simOutputs_warfarin, simOutputs_Dabigitran150):
           estimate_CI)
 
 
-def report_CEA_CBA(simOutputs_warfarin, simOutputs_Dabigitran150):
+def report_CEA_CBA(simOutputs_warfarin, simOutputs_Dabigitran150, if_paired=False):
+    """ reports the cost-effectiveness and cost-benefit analyses
+    :param if_paired: set to True if the cohorts used common random numbers (same cohort id)
+    """
     warfarin_therapy_strategy = Econ.Strategy(name="Warfarin therapy", cost_obs=simOutputs_warfarin.get_costs(),
                                                    effect_obs=simOutputs_warfarin.get_utilities())
     Dabigitran150_therapy_strategy = Econ.Strategy(name="Dabigitran150 therapy",
@@ -147,7 +162,7 @@ def report_CEA_CBA(simOutputs_warfarin, simOutputs_Dabigitran150):
 
     listofStrategies = [warfarin_therapy_strategy, Dabigitran150_therapy_strategy]
 
-    CEA = Econ.CEA(listofStrategies, if_paired=False)
+    CEA = Econ.CEA(listofStrategies, if_paired=if_paired)
 
     CEA.show_CE_plane(
         title='Cost-Effectiveness Analysis',
@@ -168,7 +183,7 @@ def report_CEA_CBA(simOutputs_warfarin, simOutputs_Dabigitran150):
         icer_digits=2,
     )
 
-    CBA = Econ.CBA(listofStrategies, if_paired=False)
+    CBA = Econ.CBA(listofStrategies, if_paired=if_paired)
 
     CBA.graph_deltaNMB_lines(
         min_wtp=0,
@@ -0,0 +1,79 @@
+import scipy.optimize as opt
+import ParameterClasses as P
+import MarkovModel as MarkovCls
+import OneWaySensitivity as OneWay
+import InputData as Data
+
+
+class ThresholdAnalysis:
+    def __init__(self, therapy, name, low, high, ref_therapy=P.Therapies.WARFARIN, wtp=Data.WTP,
+                 engine=None, cohort_id=1, input_data=Data):
+        """ finds the value of an input at which the incremental net monetary benefit of a therapy with respect
+        to a reference therapy is zero (e.g. the price at which dabigatran becomes cost-effective)
+        :param therapy: therapy to evaluate
+        :param name: name of the input, e.g. DABIGATRAN_COST, g or ANNUAL_STATE_COST[1]
+        :param low: lower end of the interval to search
+        :param high: upper end of the interval to search
+        :param ref_therapy: reference therapy
+        :param wtp: willingness-to-pay for one additional QALY
+        :param engine: simulation engine of cohorts (None to use the deterministic cohort trace); cohorts of
+            all evaluations use the same id, so the incremental NMB is smooth in the input
+        :param cohort_id: id of all cohorts
+        :param input_data: module (or object) with the base model inputs
+        """
+        self._therapies = [ref_therapy, therapy]
+        self._name = name
+        self._low = low
+        self._high = high
+        self._wtp = wtp
+        self._engine = engine
+        self._cohortID = cohort_id
+        self._inputData = input_data
+        self._outcomes = {}     # expected cost and utility of simulated cohorts, keyed by the inputs of their therapy
+        self._evaluations = []  # list of (value of the input, incremental NMB)
+
+    def _simulate(self, therapy, input_data):
+        """ :returns the expected discounted cost and utility of a cohort, simulating it only if its therapy
+        has not been simulated with the same inputs (e.g. the reference arm when the input is a drug cost) """
+
+        key = P.get_parameters_key(therapy, input_data)
+        if key not in self._outcomes:
+            if self._engine is None:
+                outputs = MarkovCls.CohortTrace(therapy, input_data=input_data).simulate()
+            else:
+                outputs = MarkovCls.Cohort(self._cohortID, therapy, self._engine, input_data=input_data).simulate()
+            self._outcomes[key] = (outputs.get_sumStat_discounted_cost().get_mean(),
+                                   outputs.get_sumStat_discounted_utility().get_mean())
+        return self._outcomes[key]
+
+    def get_incremental_nmb(self, value):
+        """ :returns the incremental net monetary benefit of the therapy when the input takes a value """
+
+        input_data = P.build_input_data(
+            self._inputData, **OneWay.get_input_overlay(self._inputData, self._name, value))
+        (ref_cost, ref_utility), (cost, utility) = [self._simulate(therapy, input_data) for therapy in self._therapies]
+        nmb = self._wtp*(utility - ref_utility) - (cost - ref_cost)
+        self._evaluations.append((value, nmb))
+        return nmb
+
+    def find_threshold(self, xtol=1e-6, max_evaluations=50):
+        """ finds the threshold with Brent's method (bisection combined with secant and inverse quadratic steps)
+        :param xtol: tolerance on the value of the input
+        :param max_evaluations: largest number of iterations
+        :returns the value of the input at which the incremental NMB is zero
+        (raises ValueError if the incremental NMB has the same sign at both ends of the interval)
+        """
+
+        return opt.brentq(self.get_incremental_nmb, self._low, self._high, xtol=xtol, maxiter=max_evaluations)
+
+    def get_evaluations(self):
+        """ :returns list of (value of the input, incremental NMB) of all evaluations """
+        return self._evaluations
+
+    def get_n_evaluations(self):
+        """ :returns the number of evaluations of the incremental NMB """
+        return len(self._evaluations)
+
+    def get_n_simulated_cohorts(self):
+        """ :returns the number of distinct cohorts simulated """
+        return len(self._outcomes)
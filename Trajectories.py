@@ -0,0 +1,256 @@
+import numpy as np
+import ParameterClasses as P
+import OutcomeStore
+import Rediscounting
+import InputData as Data
+
+_STROKE_STATES = [P.HealthStats.MINOR_STROKE.value, P.HealthStats.MAJOR_STROKE.value, P.HealthStats.TIA.value]
+_DEATH_STATES = [P.HealthStats.STROKE_DEATH.value, P.HealthStats.NON_STROKE_DEATH.value]
+
+
+class StateTrajectory:
+    def __init__(self, initial_state):
+        """ records the health states of a patient at time points 0, 1, ..., K (K is the number of time steps
+        simulated) as run-length-encoded (state, number of consecutive time points) pairs
+        :param initial_state: initial health state
+        """
+        self._states = [initial_state.value]
+        self._lengths = [1]
+
+    def extend(self, state, n_points=1):
+        """ records that the patient is in a health state at the next n_points time points """
+        if state.value == self._states[-1]:
+            self._lengths[-1] += n_points
+        else:
+            self._states.append(state.value)
+            self._lengths.append(n_points)
+
+    def get_states(self):
+        return self._states
+
+    def get_lengths(self):
+        return self._lengths
+
+
+def _get_transition_key(therapy, input_data):
+    """ :returns the inputs that determine the distribution of state trajectories of a therapy """
+    cost_name, matrix_name = P.THERAPY_INPUTS[therapy]
+    return (therapy, input_data.DELTA_T, input_data.SIM_LENGTH,
+            tuple(tuple(row) for row in getattr(input_data, matrix_name)))
+
+
+class StateTrajectories:
+    def __init__(self, states, lengths, offsets, therapy, input_data=Data, block_size=1):
+        """ run-length-encoded state trajectories of a cohort in shared flat arrays: runs offsets[i], ...,
+        offsets[i+1]-1 belong to patient i
+        :param states: health state of each run (uint8)
+        :param lengths: number of consecutive time points of each run
+        :param offsets: index of the first run of each patient, followed by the number of runs
+        :param therapy: therapy the trajectories were simulated under
+        :param input_data: module (or object) with the model inputs the trajectories were simulated with
+        :param block_size: number of consecutive patients whose outcomes are dependent under the sampling scheme
+        """
+        self._states = np.asarray(states, dtype=np.uint8)
+        self._lengths = np.asarray(lengths, dtype=np.int32)
+        self._offsets = np.asarray(offsets, dtype=np.int64)
+        self._therapy = therapy
+        self._transitionKey = _get_transition_key(therapy, input_data)
+        self._inputData = input_data
+        self._blockSize = block_size
+
+    @staticmethod
+    def from_paths(paths, therapy, input_data=Data, block_size=1):
+        """ :returns the trajectories of a list of patients' StateTrajectory """
+        n_runs = [len(path.get_states()) for path in paths]
+        return StateTrajectories(
+            [state for path in paths for state in path.get_states()],
+            [length for path in paths for length in path.get_lengths()],
+            np.concatenate(([0], np.cumsum(n_runs, dtype=np.int64))), therapy, input_data, block_size)
+
+    @staticmethod
+    def from_state_matrix(state_matrix, n_points, therapy, input_data=Data, block_size=1):
+        """ :returns the trajectories of patients from their states at every time point
+        :param state_matrix: health states (patients x time points); points after the last one of a patient
+            are ignored
+        :param n_points: number of time points of each patient
+        """
+
+        state_matrix = np.asarray(state_matrix, dtype=np.uint8)
+        n_points = np.asarray(n_points)
+        n_patients, n_columns = state_matrix.shape
+        time = np.arange(n_columns)
+
+        # a run starts at time 0 and wherever the state changes before the last time point of the patient
+        starts = np.zeros(state_matrix.shape, dtype=bool)
+        starts[:, 0] = True
+        starts[:, 1:] = (state_matrix[:, 1:] != state_matrix[:, :-1]) & (time[1:] < n_points[:, None])
+
+        rows, columns = np.nonzero(starts)
+        # a run ends where the next run of the same patient starts, or at the last time point of the patient
+        ends = np.append(columns[1:], 0)
+        last_run = np.append(rows[1:] != rows[:-1], True)
+        ends[last_run] = n_points[rows[last_run]]
+
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n_patients))))
+        return StateTrajectories(state_matrix[rows, columns], ends - columns, offsets, therapy, input_data, block_size)
+
+    @staticmethod
+    def concatenate(trajectories, block_size=1):
+        """ :returns the trajectories of consecutive groups of patients as one cohort """
+        offsets = [trajectories[0].get_offsets()]
+        for group in trajectories[1:]:
+            offsets.append(group.get_offsets()[1:] + offsets[-1][-1])
+        return StateTrajectories(
+            np.concatenate([group.get_states() for group in trajectories]),
+            np.concatenate([group.get_lengths() for group in trajectories]),
+            np.concatenate(offsets), trajectories[0].get_therapy(), trajectories[0].get_input_data(), block_size)
+
+    def get_states(self):
+        return self._states
+
+    def get_lengths(self):
+        return self._lengths
+
+    def get_offsets(self):
+        return self._offsets
+
+    def get_therapy(self):
+        return self._therapy
+
+    def get_input_data(self):
+        return self._inputData
+
+    def get_n_patients(self):
+        return len(self._offsets) - 1
+
+    def get_path(self, i):
+        """ :returns the (states, lengths) runs of patient i """
+        first, last = self._offsets[i], self._offsets[i + 1]
+        return self._states[first:last], self._lengths[first:last]
+
+    def get_patient_outcomes(self, input_data=None, horizon=None):
+        """ recalculates patients' outcomes from their trajectories without random numbers, e.g. under new
+        state costs, utilities, drug costs or discount rate, or over a shorter time horizon
+        :param input_data: module (or object) with the model inputs (None to use those of the simulation);
+            transition rates, time step and simulation length must be those of the simulation
+        :param horizon: time horizon (years) no longer than the simulation length (None for the simulation
+            length); outcomes are those of a simulation of this length with the same random numbers
+        :returns patients' outcomes (OutcomeStore.PatientOutcomes)
+        """
+
+        if input_data is None:
+            input_data = self._inputData
+        if _get_transition_key(self._therapy, input_data) != self._transitionKey:
+            raise ValueError('Trajectories can only be re-costed with the transition rates, '
+                             'time step and simulation length they were simulated with.')
+
+        param = P.get_parameters_fixed(self._therapy, input_data)
+        if horizon is None:
+            n_horizon_steps = param.get_n_time_steps()
+        elif horizon > input_data.SIM_LENGTH:
+            raise ValueError('The horizon cannot be longer than the simulation length.')
+        else:
+            # number of time steps simulated over the horizon
+            n_horizon_steps = 0
+            while n_horizon_steps*param.get_delta_t() < horizon:
+                n_horizon_steps += 1
+        cost_matrix = np.array(param.get_transition_cost_matrix())
+        utility_matrix = np.array(param.get_transition_utility_matrix())
+        discount_factors = np.append(param.get_discount_factors(), 0)
+        cum_discount_factors = np.array(param.get_cumulative_discount_factors())
+
+        states = self._states
+        lengths = self._lengths.astype(np.int64)
+        n_runs = np.diff(self._offsets)
+        first_runs = self._offsets[:-1]
+        last_runs = self._offsets[1:] - 1
+
+        # first and last time point of each run
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
+        patient_starts = np.repeat(starts[first_runs], n_runs)
+        starts -= patient_starts
+        ends = ends - patient_starts - 1
+
+        # number of time steps of each patient
+        n_steps = ends[last_runs]
+
+        # cut trajectories at the horizon (runs that start after it are dropped)
+        in_horizon = starts <= n_horizon_steps
+        is_last = np.zeros(len(states), dtype=bool)
+        is_last[last_runs] = True
+        is_last |= ends >= n_horizon_steps
+        ends = np.minimum(ends, n_horizon_steps)
+        lengths = np.where(in_horizon, ends - starts + 1, 0)
+
+        # time steps within a run stay in the same state; the time step at the end of a run (except the last run
+        # of a patient) moves to the state of the next run
+        next_states = np.append(states[1:], 0)
+        next_states[is_last] = states[is_last]
+        stay_discounts = np.where(in_horizon, cum_discount_factors[ends] - cum_discount_factors[starts], 0)
+        leave_discounts = np.where(is_last | ~in_horizon, 0, discount_factors[ends])
+
+        run_costs = cost_matrix[states, states]*stay_discounts + cost_matrix[states, next_states]*leave_discounts
+        run_utilities = utility_matrix[states, states]*stay_discounts \
+            + utility_matrix[states, next_states]*leave_discounts
+        costs = np.add.reduceat(run_costs, first_runs)
+        utilities = np.add.reduceat(run_utilities, first_runs)
+
+        # number of time steps that start in a stroke state
+        steps = np.where(in_horizon, lengths - is_last, 0)
+        count_strokes = np.add.reduceat(np.where(np.isin(states, _STROKE_STATES), steps, 0), first_runs)
+
+        # patients who died in the last time step of their trajectory within the horizon
+        died = np.isin(states[last_runs], _DEATH_STATES) & (n_steps <= n_horizon_steps)
+        survival_times = np.where(died, (n_steps - 0.5) * param.get_delta_t(), np.nan)
+
+        return OutcomeStore.PatientOutcomes(survival_times, count_strokes, costs, utilities, self._blockSize)
+
+    def get_cycle_outcomes(self, input_data=None, chunk_size=10000):
+        """ :returns the undiscounted cost and utility of patients in each time step, aggregated over patients
+        (Rediscounting.CycleOutcomes) to summarize discounted outcomes under any discount rate
+        (when patients are dependent in blocks, the means of blocks are the observations)
+        :param input_data: module (or object) with the model inputs (None to use those of the simulation)
+        :param chunk_size: largest number of patients whose time steps are expanded together
+        """
+
+        if input_data is None:
+            input_data = self._inputData
+        if _get_transition_key(self._therapy, input_data) != self._transitionKey:
+            raise ValueError('Trajectories can only be re-costed with the transition rates, '
+                             'time step and simulation length they were simulated with.')
+
+        param = P.get_parameters_fixed(self._therapy, input_data)
+        cost_matrix = np.array(param.get_transition_cost_matrix())
+        utility_matrix = np.array(param.get_transition_utility_matrix())
+        n_cycles = param.get_n_time_steps()
+        cycle_outcomes = Rediscounting.CycleOutcomes(param.get_delta_t(), n_cycles)
+
+        chunk_size = max(chunk_size // self._blockSize, 1) * self._blockSize
+        for first in range(0, self.get_n_patients(), chunk_size):
+            last = min(first + chunk_size, self.get_n_patients())
+            first_run, last_run = self._offsets[first], self._offsets[last]
+            lengths = self._lengths[first_run:last_run]
+
+            # state of each patient at each of its time points
+            states = np.repeat(self._states[first_run:last_run], lengths)
+            n_points = np.add.reduceat(lengths, self._offsets[first:last] - first_run)
+            patients = np.repeat(np.arange(last - first), n_points)
+            times = np.arange(len(states)) - np.repeat(np.cumsum(n_points) - n_points, n_points)
+
+            # time steps start at every time point except the last one of each patient
+            steps = np.ones(len(states), dtype=bool)
+            steps[np.cumsum(n_points) - 1] = False
+            next_states = np.append(states[1:], 0)
+
+            costs = np.zeros((last - first, n_cycles))
+            utilities = np.zeros((last - first, n_cycles))
+            costs[patients[steps], times[steps]] = cost_matrix[states[steps], next_states[steps]]
+            utilities[patients[steps], times[steps]] = utility_matrix[states[steps], next_states[steps]]
+
+            if self._blockSize > 1:
+                costs = costs.reshape(-1, self._blockSize, n_cycles).mean(axis=1)
+                utilities = utilities.reshape(-1, self._blockSize, n_cycles).mean(axis=1)
+            cycle_outcomes.add(costs, utilities)
+
+        return cycle_outcomes
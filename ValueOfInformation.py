@@ -0,0 +1,88 @@
+import numpy as np
+
+
+def get_nmb(costs, utilities, wtps):
+    """ :returns net monetary benefits (WTP values x draws x therapies)
+    :param costs: expected discounted costs (draws x therapies)
+    :param utilities: expected discounted utilities (draws x therapies)
+    :param wtps: willingness-to-pay values
+    """
+    wtps = np.asarray(wtps, dtype=float)
+    return wtps[:, None, None]*utilities[None] - costs[None]
+
+
+def get_spline_basis(x, n_knots=5):
+    """ :returns the design matrix of a restricted (natural) cubic regression spline of x, with knots at
+    quantiles of x and an intercept (a straight line if x takes too few distinct values)
+    :param x: values of the regressor
+    :param n_knots: number of knots
+    """
+
+    x = np.asarray(x, dtype=float)
+    knots = np.unique(np.quantile(x, np.linspace(0.05, 0.95, n_knots)))
+    columns = [np.ones(len(x)), x]
+    if len(knots) >= 3:
+        t_last, t_before_last = knots[-1], knots[-2]
+        scale = (knots[-1] - knots[0])**2
+
+        def cube(t):
+            return np.maximum(x - t, 0)**3
+
+        for t in knots[:-2]:
+            columns.append((cube(t) - cube(t_before_last)*(t_last - t)/(t_last - t_before_last)
+                            + cube(t_last)*(t_before_last - t)/(t_last - t_before_last)) / scale)
+    return np.column_stack(columns)
+
+
+class ValueOfInformation:
+    def __init__(self, psa_outputs, n_knots=5):
+        """ expected value of perfect (EVPI) and partial perfect information (EVPPI) per patient,
+        calculated from the outputs of a probabilistic sensitivity analysis without further simulation
+        :param psa_outputs: outputs of a probabilistic sensitivity analysis (ProbabilisticSensitivity.PSAOutputs)
+        :param n_knots: number of knots of the regression splines of the EVPPI metamodel
+        """
+        self._costs = psa_outputs.get_cost_matrix()
+        self._utilities = psa_outputs.get_utility_matrix()
+        self._parameterValues = psa_outputs.get_parameter_values()
+        self._nKnots = n_knots
+
+    def get_evpi(self, wtps):
+        """ :returns EVPI at each willingness-to-pay value, E[max NMB] - max E[NMB]
+        :param wtps: willingness-to-pay values
+        """
+        nmb = get_nmb(self._costs, self._utilities, wtps)
+        return np.mean(np.max(nmb, axis=2), axis=1) - np.max(np.mean(nmb, axis=1), axis=1)
+
+    def get_evppi(self, names, wtps):
+        """ :returns EVPPI of a parameter or a group of parameters at each willingness-to-pay value,
+        estimated by regressing the costs and utilities of each therapy on the parameters with an additive
+        model of restricted cubic splines (since the NMB is linear in costs and utilities, the metamodel is
+        fitted once for all willingness-to-pay values)
+        :param names: name of a parameter, or list of names of parameters (see PSAOutputs.get_parameter_values)
+        :param wtps: willingness-to-pay values
+        """
+
+        if isinstance(names, str):
+            names = [names]
+
+        # additive spline basis of the parameters that vary across draws (one intercept)
+        bases = [get_spline_basis(self._parameterValues[name], self._nKnots)[:, 1:] for name in names
+                 if np.ptp(self._parameterValues[name]) > 0]
+        if len(bases) == 0:
+            return np.zeros(len(np.atleast_1d(wtps)))
+        design = np.column_stack([np.ones(len(self._costs))] + bases)
+
+        # fitted costs and utilities of all therapies from one least-squares solve
+        outcomes = np.hstack((self._costs, self._utilities))
+        coefficients = np.linalg.lstsq(design, outcomes, rcond=None)[0]
+        fitted = design @ coefficients
+        n_therapies = self._costs.shape[1]
+        fitted_nmb = get_nmb(fitted[:, :n_therapies], fitted[:, n_therapies:], wtps)
+
+        return np.mean(np.max(fitted_nmb, axis=2), axis=1) - np.max(np.mean(fitted_nmb, axis=1), axis=1)
+
+    def get_evppi_by_parameter(self, wtps):
+        """ :returns dictionary of the EVPPI of each parameter at each willingness-to-pay value
+        :param wtps: willingness-to-pay values
+        """
+        return {name: self.get_evppi(name, wtps) for name in self._parameterValues}